@@ -1,12 +1,42 @@
-import numpy as np
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
 import pyvista as pv
 
+from geometry_metrics import map_to_curve, step_metrics
+from resonance_catalog import ResonanceCatalog
+from trixle_core import generate_chain
+
 class TrixleUniverse:
     def __init__(self):
         self.plotter = pv.Plotter(title="Trixle Theory: The Geometric Universe")
         self.bend_factor = 0.01525 # The Proton Tune
+        # Per-particle tunes from the precomputed catalog, where it has them
+        self.catalog = ResonanceCatalog()
+
+        # Particles bound to the number keys
+        self.particles = [
+            ("1", 122, "HIGGS BOSON (Ground State)"),
+            ("2", 136, "ELECTRON (Lepton Loop)"),
+            ("3", 1836, "PROTON (Baryon Knot)"),
+            ("4", 500, "HELIX MACRO-VIEW")
+        ]
+
+        # Built tubes, keyed by (N, bend, tube params), least recently shown first.
+        # Values are Futures so a key press waits on a build already in flight
+        # instead of starting a second one.
+        self.tube_params = {'n_points': 1000, 'radius': 0.1}
+
+        # Per-step geometry the tube is coloured by ([m] cycles through them)
+        self.metrics = ['edge_strain', 'torsion', 'curvature', 'centroid_distance']
+        self.metric = 0
+        self.mesh_cache = OrderedDict()
+        self.cache_size = 8
+        self.cache_lock = threading.Lock()
         
         # UI State
+        self.current_particle = None
         self.current_mesh = None
         self.text_actor = None
         
@@ -16,45 +46,53 @@ class TrixleUniverse:
         """ Generates the 3D Lattice for a specific particle resonance """
         print(f"Generating {particle_name} (N={steps})...")
         
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
+        # Apply Curvature
+        bend_factor = self.particle_bend(steps)
+        vertices = generate_chain(steps, bend_factor)
         
+        # Convert to PyVista Mesh (Tube)
+        points = vertices
+        spline = pv.Spline(points, self.tube_params['n_points'])
+
         # Color Map data (Torsion/Strain per step)
-        scalars = [0, 0, 0, 0]
+        # Measured from the lattice and laid along the spline by arc length;
+        # the tube filter carries the spline's point data onto its rings
+        # Higher stress = Warmer color
+        for name, values in step_metrics(vertices).items():
+            spline.point_data[name] = map_to_curve(values, vertices, spline.points)
+        tube = spline.tube(radius=self.tube_params['radius'])
         
-        for i in range(steps):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            # Apply Curvature
-            theta = self.bend_factor
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
+        return tube, points
 
-            vertices.append(face_center - v_rot)
-            
-            # Add a scalar value for color (Simulate Torsion Stress)
-            # Higher stress = Warmer color
-            stress = (np.sin(i * 0.1) + 1) / 2 # Simple wave for visualization
-            scalars.append(stress)
+    def particle_bend(self, steps):
+        return self.catalog.best_factor(steps, default=self.bend_factor)
 
-        # Convert to PyVista Mesh (Tube)
-        points = np.array(vertices)
-        spline = pv.Spline(points, 1000)
-        tube = spline.tube(radius=0.1)
-        
-        return tube, points
+    def get_lattice(self, steps, particle_name):
+        """ generate_lattice through the LRU mesh cache (safe from any thread) """
+        key = (steps, self.particle_bend(steps), self.tube_params['n_points'], self.tube_params['radius'])
+        with self.cache_lock:
+            future = self.mesh_cache.get(key)
+            build = future is None
+            if build:
+                future = self.mesh_cache[key] = Future()
+                while len(self.mesh_cache) > self.cache_size:
+                    self.mesh_cache.popitem(last=False)
+            else:
+                self.mesh_cache.move_to_end(key)
+
+        if build:
+            try:
+                future.set_result(self.generate_lattice(steps, particle_name))
+            except Exception as exc:
+                with self.cache_lock:
+                    self.mesh_cache.pop(key, None)
+                future.set_exception(exc)
+        return future.result()
+
+    def prefetch(self):
+        """ Builds every bound particle up front so key presses only swap actors """
+        for _, n, name in self.particles:
+            self.get_lattice(n, name)
 
     def render_particle(self, n, name):
         # Clear old mesh
@@ -62,11 +100,13 @@ class TrixleUniverse:
             self.plotter.remove_actor(self.current_mesh)
             
         # Generate new data
-        tube, points = self.generate_lattice(n, name)
+        tube, points = self.get_lattice(n, name)
         
         # Add to scene
+        self.current_particle = (n, name)
         self.current_mesh = self.plotter.add_mesh(
             tube, 
+            scalars=self.metrics[self.metric],
             cmap="plasma", 
             show_scalar_bar=False,
             opacity=0.9,
@@ -81,6 +121,7 @@ class TrixleUniverse:
             f"OBJECT: {name}\n"
             f"LATTICE STEPS: {n}\n"
             f"GEOMETRY: Boerdijk-Coxeter Helix\n"
+            f"COLOUR: {self.metrics[self.metric]}\n"
             f"STATUS: Resonance Lock"
         )
         self.text_actor = self.plotter.add_text(
@@ -95,23 +136,30 @@ class TrixleUniverse:
         self.plotter.view_isometric()
         self.plotter.reset_camera()
 
+    def cycle_metric(self):
+        self.metric = (self.metric + 1) % len(self.metrics)
+        if self.current_particle:
+            self.render_particle(*self.current_particle)
+
     def setup_scene(self):
         # Background
         self.plotter.set_background("#050510") # Deep Space Blue
         
         # Instructions
         self.plotter.add_text(
-            "CONTROLS:\n[1] Higgs (N=122)\n[2] Electron (N=136)\n[3] Proton (N=1836)\n[4] DNA Scale (N=500)",
+            "CONTROLS:\n[1] Higgs (N=122)\n[2] Electron (N=136)\n[3] Proton (N=1836)\n[4] DNA Scale (N=500)\n[M] Cycle Colour Metric",
             position='lower_left',
             font_size=10,
             color='gray'
         )
 
         # Key Bindings
-        self.plotter.add_key_event("1", lambda: self.render_particle(122, "HIGGS BOSON (Ground State)"))
-        self.plotter.add_key_event("2", lambda: self.render_particle(136, "ELECTRON (Lepton Loop)"))
-        self.plotter.add_key_event("3", lambda: self.render_particle(1836, "PROTON (Baryon Knot)"))
-        self.plotter.add_key_event("4", lambda: self.render_particle(500, "HELIX MACRO-VIEW"))
+        for key, n, name in self.particles:
+            self.plotter.add_key_event(key, lambda n=n, name=name: self.render_particle(n, name))
+        self.plotter.add_key_event("m", self.cycle_metric)
+
+        # Build the particles in the background while the first one is shown
+        threading.Thread(target=self.prefetch, daemon=True).start()
 
         # Initial View
         self.render_particle(122, "HIGGS BOSON (Ground State)")
@@ -2,111 +2,109 @@ import numpy as np
 import pyvista as pv
 import time
 
+from trixle_core import face_centers, generate_chain
+from wave_dynamics import WaveSolver
+
 class QuantumFlow:
-    def __init__(self):
+    def __init__(self, tube_length=400, fps=60):
         self.plotter = pv.Plotter(title="Trixle Theory: Soliton Gap Propagation")
         self.bend_factor = 0.015  
-        self.tube_length = 400    
+        self.tube_length = tube_length
+        self.fps = fps
         
         self.playing = True
         self.frame = 0
         self.tube_mesh = None
         self.scalars = None
+        self.node_map = None
+        self.text_actor = None
+
+        # The soliton: a sine-Gordon kink (a full 2*pi twist) travelling along
+        # the lattice graph. It reflects off the free ends as an anti-kink.
+        self.solver = WaveSolver(self.tube_length, coupling=1.0, mass=0.2, dt=0.1)
+        self.solver.add_kink(center=self.tube_length // 10, velocity=0.5)
+        self.steps_per_frame = 5
+        # Frames a slow render may skip are still simulated, up to this many
+        self.max_catch_up = 4
         
         self.setup_scene()
         
     def generate_path(self):
         """ Generates the Boerdijk-Coxeter Helix Points """
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
+        vertices = generate_chain(self.tube_length, self.bend_factor)
         
-        path = []
-        for i in range(self.tube_length):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            
-            path.append(face_center)
-            
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = self.bend_factor
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        return np.array(path)
-
-    def update_animation(self):
-        if not self.playing:
-            return
+        # The path follows the center of each exposed face
+        return face_centers(vertices)[:self.tube_length]
 
+    def update_animation(self, frames=1):
         # 1. CALCULATE STATE
-        # We are not moving an object. We are calculating the 'Stress Index'
-        # of the lattice at this moment in time.
-        idx = self.frame % self.tube_length
-        
-        # 2. RESET FIELD (The Vacuum)
-        # Set background energy to 0.1 (Blue/Cold)
-        self.scalars[:] = 0.1
-        
-        # 3. EXCITE THE FIELD (The Pulse)
-        # We modify the scalar values of the lattice nodes directly.
-        # This represents the "Twist" passing from neighbor to neighbor.
-        pulse_width = 20
-        for i in range(-pulse_width, pulse_width):
-            target_idx = (idx + i) % self.tube_length
-            
-            # Create a Bell Curve of intensity (The Soliton shape)
-            intensity = 1.0 - (abs(i) / pulse_width)
-            if intensity < 0: intensity = 0
-            
-            # Update the scalar array
-            self.scalars[target_idx] = 0.1 + (intensity * 2.0) 
+        # We are not moving an object. We integrate the wave equation of the
+        # lattice and read off the energy stored at every node.
+        self.solver.step(self.steps_per_frame * min(frames, self.max_catch_up))
+        
+        # 2. THE FIELD
+        # Vacuum nodes hold no energy (Blue/Cold), the twist concentrates it
+        self.scalars[:] = self.solver.energy_density()
+        idx = int(np.argmax(self.scalars))
 
-        # 4. MAP DATA TO VISUALS
-        # Expand the path scalars to match the tube mesh resolution
-        mesh_points = self.tube_mesh.n_points
-        expanded_scalars = np.repeat(self.scalars, mesh_points // self.tube_length + 1)[:mesh_points]
+        # 3. MAP DATA TO VISUALS
+        # Every tube point reads the node it was swept from
+        self.tube_mesh.point_data['Energy'][:] = self.scalars[self.node_map]
         
-        # Inject the new data into the existing static mesh
-        self.tube_mesh.point_data['Energy'][:] = expanded_scalars
-        
-        self.plotter.add_text(
-            f"LATTICE STATE: Excitation at Node {idx}", 
-            name='status', 
-            position='upper_left', 
-            color='white', 
-            font_size=12
-        )
-        
-        self.frame += 1
-        time.sleep(0.01)
+        self.text_actor.SetText(2, f"LATTICE STATE: Excitation at Node {idx} | t = {self.solver.time:.1f}")
+
+    def run(self):
+        """
+        Frames are paced by the monotonic clock rather than by sleeps:
+        each tick shows the frame that is due now, skipping any the
+        renderer was too slow for, then sleeps until the next frame is due.
+        """
+        clock = time.perf_counter
+        start = clock() - self.frame / self.fps
+        while True:
+            if not self.playing:
+                # Hold the clock so playback resumes where it paused
+                start = clock() - self.frame / self.fps
+            due = int((clock() - start) * self.fps)
+            if due != self.frame:
+                self.update_animation(due - self.frame)
+                self.frame = due
+
+            try:
+                self.plotter.update()
+            except AttributeError:
+                break
+            except Exception as e:
+                print(f"Error: {e}")
+                break
+
+            wait = start + (due + 1) / self.fps - clock()
+            if wait > 0:
+                time.sleep(wait)
+
+    def toggle_play(self):
+        self.playing = not self.playing
 
     def setup_scene(self):
         # 1. Generate Static Geometry (The Vacuum)
         print("Generating Vacuum Lattice...")
         path_points = self.generate_path()
-        spline = pv.Spline(path_points, len(path_points) * 1)
-        self.tube_mesh = spline.tube(radius=0.5, n_sides=12)
+
+        # The path already has one point per node, so it is swept as is
+        # (resampling it through pv.Spline costs O(N^2) and adds no detail)
+        path = pv.MultipleLines(path_points)
+
+        # Tag every path point with its lattice node; the tube filter copies
+        # the tag onto the ring it sweeps around that point
+        path.point_data['node'] = np.arange(len(path_points))
+        self.tube_mesh = path.tube(radius=0.5, n_sides=12)
+        self.node_map = self.tube_mesh.point_data['node'].astype(np.intp)
         
         # 2. Prepare Data Arrays
-        self.scalars = np.zeros(self.tube_length)
+        self.scalars = self.solver.energy_density()
         
         # Initialize the mesh with the data structure
-        mesh_points = self.tube_mesh.n_points
-        expanded_scalars = np.repeat(self.scalars, mesh_points // self.tube_length + 1)[:mesh_points]
-        self.tube_mesh.point_data['Energy'] = expanded_scalars
+        self.tube_mesh.point_data['Energy'] = self.scalars[self.node_map]
         
         # 3. Render
         # Use 'plasma' colormap: Blue = Low Energy, Yellow = High Energy
@@ -115,15 +113,24 @@ class QuantumFlow:
             self.tube_mesh, 
             scalars='Energy',
             cmap='plasma', 
+            clim=[0.0, 1.05 * self.scalars.max()],
             style='wireframe',    
             line_width=3,        
             show_scalar_bar=False,
             lighting=False       
         )
+        self.text_actor = self.plotter.add_text(
+            "LATTICE STATE: Excitation at Node 0", 
+            name='status', 
+            position='upper_left', 
+            color='white', 
+            font_size=12
+        )
         
         # 4. High Contrast Environment
         self.plotter.set_background('#202020') # Dark Grey (High visibility)
         self.plotter.add_axes()
+        self.plotter.add_key_event("space", self.toggle_play)
         self.plotter.reset_camera()            
         self.plotter.camera.zoom(1.2)
         
@@ -131,16 +138,8 @@ class QuantumFlow:
         print("Visualizing Lattice Excitation (No Particles)...")
         
         self.plotter.show(interactive_update=True)
-        
-        while True:
-            try:
-                self.update_animation()
-                self.plotter.update()
-            except AttributeError:
-                break
-            except Exception as e:
-                print(f"Error: {e}")
-                break
+        self.update_animation(0)
+        self.run()
 
 if __name__ == "__main__":
-    QuantumFlow()
\ No newline at end of file
+    QuantumFlow()
@@ -1,6 +1,10 @@
-import numpy as np
-import pyvista as pv
+import threading
 import time
+from concurrent.futures import Future
+
+import pyvista as pv
+
+from trixle_core import generate_chain, modulation_profiles
 
 class FusionReactor:
     def __init__(self):
@@ -12,6 +16,12 @@ class FusionReactor:
         self.actor_a = None
         self.actor_b = None
         self.actor_he = None
+
+        # Built tubes, keyed by (steps, bend, spline points, radius). Values are
+        # Futures, so asking for a loop that is still being built waits for it.
+        self.loop_cache = {}
+        self.cache_lock = threading.Lock()
+        self.helium = None
         
         # Animation State
         self.separation = 4.0 # Starting distance
@@ -23,38 +33,42 @@ class FusionReactor:
         
     def generate_proton_loop(self, steps):
         """ Generates a single Proton Loop (Figure-8 Topology) """
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
+        # Apply a twist modulation to create the Figure-8 lobes
+        profile = modulation_profiles(steps, self.bend_factor, [0.05], [2])[0, 0]
         
-        path = []
-        for i in range(steps):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            
-            # Apply a twist modulation to create the Figure-8 lobes
-            modulation = 1.0 + 0.05 * np.sin(i * 4 * np.pi / steps)
-            
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = self.bend_factor * modulation
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            new_pos = face_center - v_rot
-            vertices.append(new_pos)
-            path.append(new_pos)
-            
-        return np.array(path)
+        vertices = generate_chain(steps, profile)
+        
+        return vertices[4:]
+
+    def loop_tube(self, steps, n_points, radius):
+        """ The tube around a loop, built once per distinct loop (safe from any thread) """
+        key = (steps, self.bend_factor, n_points, radius)
+        with self.cache_lock:
+            future = self.loop_cache.get(key)
+            build = future is None
+            if build:
+                future = self.loop_cache[key] = Future()
+
+        if build:
+            try:
+                path = self.generate_proton_loop(steps)
+                future.set_result(pv.Spline(path, n_points).tube(radius=radius))
+            except Exception as exc:
+                future.set_exception(exc)
+        return future.result()
+
+    def build_in_background(self, steps, n_points, radius):
+        """ Starts building a loop tube on a worker thread; returns its Future """
+        result = Future()
+
+        def work():
+            try:
+                result.set_result(self.loop_tube(steps, n_points, radius))
+            except Exception as exc:
+                result.set_exception(exc)
+
+        threading.Thread(target=work, daemon=True).start()
+        return result
 
     def update_text(self, text):
         # By using name='status', PyVista automatically replaces the old text
@@ -88,17 +102,8 @@ class FusionReactor:
             if self.actor_b: self.plotter.remove_actor(self.actor_b)
             
             # Show the merged Helium Nucleus (Tighter, brighter)
-            he_path = self.generate_proton_loop(3600) 
-            he_spline = pv.Spline(he_path, 3600)
-            he_tube = he_spline.tube(radius=0.4)
-            
-            self.actor_he = self.plotter.add_mesh(
-                he_tube, 
-                color='cyan', 
-                style='wireframe', 
-                line_width=4,
-                emissive=True
-            )
+            # Already in the scene, hidden, so the merge frame does no mesh work
+            self.actor_he.SetVisibility(True)
             self.update_text("STATUS: FUSION IGNITION (Energy Release)")
 
         # PHASE 3: ENERGY RELEASE (The Flash)
@@ -117,29 +122,31 @@ class FusionReactor:
 
     def setup_scene(self):
         # 1. Generate the Geometry
-        print("Generating Proton A (1836 Trixles)...")
-        path_a = self.generate_proton_loop(self.proton_size)
-        
-        print("Generating Proton B (1836 Trixles)...")
-        path_b = self.generate_proton_loop(self.proton_size)
-        
-        # 2. Create Meshes
-        spline_a = pv.Spline(path_a, 1000)
-        tube_a = spline_a.tube(radius=0.3)
-        
-        spline_b = pv.Spline(path_b, 1000)
-        tube_b = spline_b.tube(radius=0.3)
+        # The Helium loop is only needed at ignition: build it while the proton builds
+        print("Generating Helium-4 (3600 Trixles) in the background...")
+        self.helium = self.build_in_background(3600, 3600, 0.4)
+
+        # Both protons are the same loop, so they share one mesh
+        print("Generating Proton (1836 Trixles)...")
+        proton_tube = self.loop_tube(self.proton_size, 1000, 0.3)
         
-        # 3. Add to Scene
+        # 2. Add to Scene
         self.actor_a = self.plotter.add_mesh(
-            tube_a, color='orange', style='wireframe', line_width=2
+            proton_tube, color='orange', style='wireframe', line_width=2, name='proton_a'
         )
         
         self.actor_b = self.plotter.add_mesh(
-            tube_b, color='red', style='wireframe', line_width=2
+            proton_tube, color='red', style='wireframe', line_width=2, name='proton_b'
+        )
+
+        # The Helium loop was built alongside the proton; it stays hidden until ignition
+        he_tube = self.helium.result()
+        self.actor_he = self.plotter.add_mesh(
+            he_tube, color='cyan', style='wireframe', line_width=4, emissive=True, name='helium'
         )
+        self.actor_he.SetVisibility(False)
         
-        # 4. Initial UI
+        # 3. Initial UI
         self.update_text("Initializing Reactor...")
         
         self.plotter.set_background('black')
@@ -1,13 +1,23 @@
 import numpy as np
 import pyvista as pv
+import vtk
+
+from trixle_core import face_centers, generate_chain
 
 class LatticeTapestry:
-    def __init__(self):
+    def __init__(self, rings=1, instance_threshold=200):
         self.plotter = pv.Plotter(title="Trixle Theory: The Vacuum Tapestry")
         self.bend_factor = 0.015  # The fundamental grain
         self.strand_length = 300  # Length of the threads
         # How far apart the strands are packed
         self.packing_radius = 1.6 
+        # Hexagonal rings around the central strand (1 ring = 7 strands, 58 rings > 10k)
+        self.rings = rings
+        # Above this many strands the GPU instances one tube instead of merging copies
+        self.instance_threshold = instance_threshold
+
+        # Strand colour by ring, cycling outwards from the centre
+        self.colors = ['cyan', 'blue', 'teal', 'dodgerblue']
         
         self.setup_scene()
         
@@ -16,75 +26,96 @@ class LatticeTapestry:
         Generates a standard BC-helix, shifted by a starting offset vector.
         """
         # Standard starting tetrahedron
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
+        vertices = generate_chain(self.strand_length, self.bend_factor)
         
-        # Shift initial vertices by the offset
+        # Shift the path by the offset (the stacking is translation invariant)
         offset_vec = np.array(start_offset)
-        vertices = [v + offset_vec for v in vertices]
+        path = face_centers(vertices)[:self.strand_length]
         
-        path = []
-        
-        for i in range(self.strand_length):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            
-            path.append(face_center)
-            
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = self.bend_factor
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        return np.array(path)
+        return path + offset_vec
+
+    def hex_offsets(self):
+        """
+        Strand positions on a hexagonal grid in the XY plane, `rings` rings
+        around the centre. Returns the (M, 3) offsets and each strand's ring.
+        """
+        n = self.rings
+        q, r = np.meshgrid(np.arange(-n, n + 1), np.arange(-n, n + 1), indexing='ij')
+        q, r = q.ravel(), r.ravel()
+        ring = np.maximum(np.maximum(np.abs(q), np.abs(r)), np.abs(q + r))
+        keep = ring <= n
+        q, r, ring = q[keep], r[keep], ring[keep]
+
+        # Axial hex coordinates -> cartesian, neighbours one packing radius apart
+        x = self.packing_radius * (q + 0.5 * r)
+        y = self.packing_radius * (np.sqrt(3) / 2 * r)
+        offsets = np.column_stack([x, y, np.zeros_like(x)])
+        order = np.argsort(ring, kind='stable')
+        return offsets[order], ring[order]
+
+    def merged_strands(self, tube, offsets, ring):
+        """ Every copy of the tube in one PolyData, built by broadcasting """
+        tube = tube.triangulate()
+        faces = tube.regular_faces
+        n_points = tube.n_points
+
+        merged = pv.PolyData()
+        merged.points = (tube.points[None, :, :] + offsets[:, None, :]).reshape(-1, 3).astype(np.float32)
+        shift = (np.arange(len(offsets)) * n_points)[:, None, None]
+        merged.faces = pv.CellArray.from_regular_cells((faces[None] + shift).reshape(-1, 3).astype(np.int32))
+        merged.point_data['ring'] = np.repeat(ring % len(self.colors), n_points)
+        return merged
+
+    def add_instanced_strands(self, tube, offsets, ring):
+        """ One tube on the GPU drawn at every offset (memory does not grow with the count) """
+        centres = pv.PolyData(offsets)
+        centres.point_data['ring'] = ring % len(self.colors)
+
+        mapper = vtk.vtkGlyph3DMapper()
+        mapper.SetInputData(centres)
+        mapper.SetSourceData(tube)
+        mapper.ScalingOff()
+        mapper.OrientOff()
+        mapper.SetScalarModeToUsePointFieldData()
+        mapper.SelectColorArray('ring')
+        mapper.SetLookupTable(pv.LookupTable(cmap=self.colors))
+        mapper.SetScalarRange(0, len(self.colors) - 1)
+
+        actor = vtk.vtkActor()
+        actor.SetMapper(mapper)
+        prop = actor.GetProperty()
+        prop.SetRepresentationToWireframe()
+        prop.SetOpacity(0.6)
+        prop.SetLineWidth(1)
+        self.plotter.add_actor(actor, name='tapestry')
+        return actor
 
     def setup_scene(self):
         print("Weaving the Lattice Tapestry...")
         
-        # Define packing arrangement (A central strand surrounded by 6 hex neighbors)
-        r = self.packing_radius
-        # Using sin/cos for a hexagonal packing pattern around the Z-axis roughly
-        offsets = [
-            (0, 0, 0), # Center
-            (r, 0, 0),
-            (-r, 0, 0),
-            (r * np.cos(np.pi/3), r * np.sin(np.pi/3), 0),
-            (r * np.cos(np.pi/3), -r * np.sin(np.pi/3), 0),
-            (-r * np.cos(np.pi/3), r * np.sin(np.pi/3), 0),
-            (-r * np.cos(np.pi/3), -r * np.sin(np.pi/3), 0),
-        ]
-        
-        colors = ['cyan', 'blue', 'blue', 'teal', 'teal', 'dodgerblue', 'dodgerblue']
-
-        # Generate and add each strand
-        for i, offset in enumerate(offsets):
-            print(f"Generating Strand {i+1}/{len(offsets)}...")
-            path = self.generate_helix_path(offset)
-            
-            # Create the visual tube
-            spline = pv.Spline(path, len(path) * 2)
-            # Radius 0.5 ensures they nestle without totally overlapping
-            tube = spline.tube(radius=0.5, n_sides=16)
-            
-            # Add to scene with wireframe style to see inside the structure
+        # Every strand is the same helix shifted, so it is generated and tubed once
+        print("Generating Strand...")
+        path = self.generate_helix_path((0, 0, 0))
+        spline = pv.Spline(path, len(path) * 2)
+        # Radius 0.5 ensures they nestle without totally overlapping
+        tube = spline.tube(radius=0.5, n_sides=16)
+
+        # Define packing arrangement (A central strand surrounded by hex rings)
+        offsets, ring = self.hex_offsets()
+        print(f"Packing {len(offsets)} strands in {self.rings} hexagonal rings...")
+
+        # Wireframe style to see inside the structure, semi-transparent to see depth
+        if len(offsets) > self.instance_threshold:
+            self.add_instanced_strands(tube, offsets, ring)
+        else:
             self.plotter.add_mesh(
-                tube, 
+                self.merged_strands(tube, offsets, ring), 
+                scalars='ring',
+                cmap=self.colors,
+                clim=[0, len(self.colors) - 1],
+                show_scalar_bar=False,
                 style='wireframe', 
-                color=colors[i % len(colors)], 
-                opacity=0.6, # Semi-transparent to see depth
+                opacity=0.6,
                 line_width=1
             )
 
@@ -104,4 +135,4 @@ class LatticeTapestry:
         self.plotter.show()
 
 if __name__ == "__main__":
-    LatticeTapestry()
\ No newline at end of file
+    LatticeTapestry()
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from topology_metrics import chain_topology
+from trixle_core import generate_chain, prefix_scan
+
 class AlphaScanner:
     """
     Scans the Trixle Lattice around the N=136 (Electron) region to investigate
@@ -15,62 +18,27 @@ class AlphaScanner:
         self.bend_factor = 0.1555 # The Electron Resonance Bend
         
     def get_torsion_and_gap(self, steps):
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
-        
-        # Build the chain
-        for i in range(steps):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = self.bend_factor
-            
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        # 1. MEASURE CLOSURE GAP (Mass Potential)
-        start_center = np.mean(vertices[:4], axis=0)
-        end_center = np.mean(vertices[-4:], axis=0)
-        gap = np.linalg.norm(end_center - start_center)
-
-        # 2. MEASURE TORSION (Magnetic Potential)
-        def get_normal(indices):
-            p1, p2, p3 = vertices[indices[0]], vertices[indices[1]], vertices[indices[2]]
-            v1 = p2 - p1
-            v2 = p3 - p1
-            n = np.cross(v1, v2)
-            return n / np.linalg.norm(n)
+        # Closure Gap (Mass Potential) and end-face Torsion (Magnetic Potential)
+        gaps, torsions = prefix_scan([steps], self.bend_factor)
+        return gaps[0], torsions[0]
 
-        n_start = get_normal([0, 1, 2])
-        n_end = get_normal([len(vertices)-3, len(vertices)-2, len(vertices)-1])
-        
-        dot = np.clip(np.dot(n_start, n_end), -1.0, 1.0)
-        torsion_degrees = np.degrees(np.arccos(dot))
-        
-        return gap, torsion_degrees
+    def get_topology(self, steps):
+        # How the twist is spread along the whole loop, and how much it writhes
+        return chain_topology(generate_chain(steps, self.bend_factor))
 
     def run_scan(self):
         print("--- FINE STRUCTURE SCAN (130-145) ---")
-        ns, gaps, torsions = [], [], []
-        
-        for n in range(130, 145):
-            gap, torsion = self.get_torsion_and_gap(n)
-            ns.append(n)
-            gaps.append(gap)
-            torsions.append(torsion)
+        # Every N is a prefix of the N=144 chain: build it once
+        ns = np.arange(130, 145)
+        gaps, torsions = prefix_scan(ns, self.bend_factor)
+
+        # Whole-loop twist and writhe of every prefix of the same chain
+        vertices = generate_chain(int(ns[-1]), self.bend_factor)
+        print(f"{'N':>4} | {'Gap':>7} | {'End Twist':>9} | {'Total Twist':>11} | {'Spread':>7} | {'Writhe':>7}")
+        for n, gap, torsion in zip(ns, gaps, torsions):
+            topo = chain_topology(vertices[:n + 4])
+            print(f"{n:>4} | {gap:7.3f} | {torsion:8.2f}° | {topo['total_twist']:9.3f} t | "
+                  f"{topo['twist_spread']:6.2f}° | {topo['writhe']:7.4f}")
             
         # Plotting
         fig, ax1 = plt.subplots(figsize=(10, 6))
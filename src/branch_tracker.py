@@ -0,0 +1,252 @@
+import numpy as np
+
+from resonance import bracket_minima, chain_gaps, gap_slopes, refine_minima
+
+# One row per branch per chain length
+BRANCH_DTYPE = np.dtype([
+    ('branch', '<i8'),
+    ('steps', '<i8'),
+    ('theta', '<f8'),
+    ('gap', '<f8')
+])
+
+
+def scaling_window(scale=21.0, spread=0.5):
+    """ The Bend ~ scale / N search window, +-spread around the estimate, as a function of N. """
+    return lambda steps: (scale / steps * (1.0 - spread), scale / steps * (1.0 + spread))
+
+
+class BranchTracker:
+    """
+    Follows every local minimum of gap(theta) from one chain length to the next.
+
+    Each branch predicts its next bend from its last one plus its drift per
+    step. Before a branch has a drift, the bend is scaled by N / (N + 1),
+    following the Bend ~ 21/N law. Three probes around the prediction
+    bracket the minimum, walking downhill when they do not. Then every
+    branch is refined together with refine_minima, so a step of N costs a
+    few batched chain builds whatever the number of branches.
+
+    A coarse scan of the window every `rescan_every` steps picks up
+    minima no branch is following: those are births. Two branches that
+    converge on the same bend merge, and the older one carries on. A
+    branch whose bracket walks out of the window, or does not close within
+    `max_walk` probes, vanishes. Every (branch, N, theta, gap) row is kept
+    in `rows` and every event in `events`.
+    """
+    def __init__(self, window=None, hinge='edge', coarse=32, tol=1e-7, merge_tol=1e-6,
+                 rescan_every=10, max_walk=8):
+        self.window = window if window is not None else scaling_window()
+        self.hinge = hinge
+        self.coarse = coarse
+        self.tol = tol
+        self.merge_tol = merge_tol
+        self.rescan_every = rescan_every
+        self.max_walk = max_walk
+
+        self.rows = []
+        self.events = []
+        self.chain_builds = 0
+        self._next_id = 0
+        # Live branches: id -> (last N, theta, drift per step or None)
+        self._live = {}
+        self._since_scan = None
+
+    def _gaps(self, steps, thetas):
+        self.chain_builds += np.size(thetas)
+        return chain_gaps(steps, thetas, self.hinge)
+
+    def _slopes(self, steps, thetas):
+        self.chain_builds += np.size(thetas)
+        return gap_slopes(steps, thetas, self.hinge)
+
+    def run(self, step_counts):
+        """ Tracks every branch over the (increasing) step counts; returns the branch table. """
+        for steps in step_counts:
+            self.step(int(steps))
+        return self.table()
+
+    def step(self, steps):
+        lo, hi = self.window(steps)
+        if self._live:
+            self._follow(steps, lo, hi)
+        if self._since_scan is None or self._since_scan + 1 >= self.rescan_every or not self._live:
+            self._scan(steps, lo, hi)
+            self._since_scan = 0
+        else:
+            self._since_scan += 1
+
+    def _follow(self, steps, lo, hi):
+        ids = np.array(list(self._live))
+        last_n = np.array([self._live[b][0] for b in ids])
+        theta = np.array([self._live[b][1] for b in ids])
+        drift = np.array([np.nan if self._live[b][2] is None else self._live[b][2] for b in ids])
+
+        fresh = np.isnan(drift)
+        predicted = np.where(fresh, theta * last_n / steps, theta + drift * (steps - last_n))
+        moved = np.abs(predicted - theta)
+        width = np.maximum(2.0 * moved, 1e-3 * predicted)
+
+        a, b, x0, found = self._bracket(steps, predicted, width, lo, hi)
+        for branch in ids[~found].tolist():
+            self._end(branch, steps, 'vanish')
+        if not found.any():
+            return
+
+        ids, a, b, x0 = ids[found], a[found], b[found], x0[found]
+        thetas, gaps, _ = refine_minima(lambda t: self._slopes(steps, t), a, b, x0, tol=self.tol)
+        # The refined minimum can still settle just outside the window
+        inside = (thetas >= lo) & (thetas <= hi)
+        for branch in ids[~inside].tolist():
+            self._end(branch, steps, 'vanish')
+        ids, thetas, gaps = ids[inside], thetas[inside], gaps[inside]
+        for branch, t, g in zip(ids.tolist(), thetas.tolist(), gaps.tolist()):
+            prev_n, prev_theta, _ = self._live[branch]
+            self._live[branch] = (steps, t, (t - prev_theta) / (steps - prev_n))
+            self.rows.append((branch, steps, t, g))
+
+        # Branches that found the same minimum merge into the oldest of them
+        order = np.argsort(thetas, kind='stable')
+        for i, j in zip(order[:-1], order[1:]):
+            if abs(thetas[j] - thetas[i]) <= self.merge_tol * max(abs(thetas[i]), 1.0):
+                keep, drop = sorted((int(ids[i]), int(ids[j])))
+                if drop in self._live and keep in self._live:
+                    self.rows.pop(self._row_index(drop, steps))
+                    self._end(drop, steps, 'merge', keep)
+                    # Relabel so a run of three or more collapses onto the oldest
+                    ids[ids == drop] = keep
+
+    def _row_index(self, branch, steps):
+        for k in range(len(self.rows) - 1, -1, -1):
+            if self.rows[k][0] == branch and self.rows[k][1] == steps:
+                return k
+        raise KeyError((branch, steps))
+
+    def _bracket(self, steps, centre, width, lo, hi):
+        """
+        Probes centre - width, centre, centre + width for every branch at once,
+        shifting the triple downhill by `width` until its middle is lowest.
+        A triple whose middle lies outside [lo, hi] is not found.
+        Returns (lo, hi, x0, found) arrays.
+        """
+        x = centre[:, None] + width[:, None] * np.array([-1.0, 0.0, 1.0])
+        f = self._gaps(steps, x)
+        found = f[:, 1] <= np.minimum(f[:, 0], f[:, 2])
+        lost = (x[:, 1] < lo) | (x[:, 1] > hi)
+
+        for _ in range(self.max_walk):
+            todo = np.flatnonzero(~found & ~lost)
+            if len(todo) == 0:
+                break
+            left = f[todo, 0] < f[todo, 2]
+            new_x = np.where(left, x[todo, 0] - width[todo], x[todo, 2] + width[todo])
+            new_f = self._gaps(steps, new_x)
+            x[todo] = np.where(left[:, None],
+                               np.column_stack([new_x, x[todo, 0], x[todo, 1]]),
+                               np.column_stack([x[todo, 1], x[todo, 2], new_x]))
+            f[todo] = np.where(left[:, None],
+                               np.column_stack([new_f, f[todo, 0], f[todo, 1]]),
+                               np.column_stack([f[todo, 1], f[todo, 2], new_f]))
+            found[todo] = f[todo, 1] <= np.minimum(f[todo, 0], f[todo, 2])
+            lost[todo] = (x[todo, 1] < lo) | (x[todo, 1] > hi)
+        return x[:, 0], x[:, 2], x[:, 1], found & ~lost
+
+    def _scan(self, steps, lo, hi):
+        """ Coarse pass over the window; minima no branch is following are born. """
+        xs = np.linspace(lo, hi, self.coarse)
+        fs = self._gaps(steps, xs)
+        i = bracket_minima(xs, fs)
+
+        spacing = xs[1] - xs[0]
+        tracked = np.array([t for n, t, _ in self._live.values() if n == steps])
+        if len(tracked):
+            near = np.abs(xs[i][:, None] - tracked[None, :]).min(axis=1) < spacing
+            i = i[~near]
+        if len(i) == 0:
+            return
+
+        # A minimum on the window's edge is bracketed by the edge itself, as in find_resonances
+        thetas, gaps, _ = refine_minima(lambda t: self._slopes(steps, t), xs[np.maximum(i - 1, 0)],
+                                        xs[np.minimum(i + 1, self.coarse - 1)], xs[i], tol=self.tol)
+        for t, g in zip(thetas.tolist(), gaps.tolist()):
+            if len(tracked) and np.abs(tracked - t).min() <= self.merge_tol * max(abs(t), 1.0):
+                continue
+            branch = self._next_id
+            self._next_id += 1
+            self._live[branch] = (steps, t, None)
+            self.rows.append((branch, steps, t, g))
+            self.events.append((steps, 'appear', branch, -1))
+            tracked = np.append(tracked, t)
+
+    def _end(self, branch, steps, kind, other=-1):
+        del self._live[branch]
+        self.events.append((steps, kind, branch, other))
+
+    def table(self):
+        """ Every (branch, N, theta, gap) row as a structured array, ordered by branch then N. """
+        table = np.array(self.rows, dtype=BRANCH_DTYPE)
+        return table[np.lexsort((table['steps'], table['branch']))]
+
+    def best_per_step(self):
+        """
+        The lowest-gap row of every N among the branches being tracked. A
+        minimum no branch follows is only seen at a rescan, so this matches a
+        global search per N only with rescan_every=1.
+        """
+        table = self.table()
+        table = table[np.lexsort((table['gap'], table['steps']))]
+        first = np.r_[True, table['steps'][1:] != table['steps'][:-1]]
+        return table[first]
+
+    def summary(self):
+        """ One line per branch: its lifetime, how it ended, and its closest closure. """
+        table = self.table()
+        fates = {}
+        for steps, kind, branch, other in self.events:
+            if kind == 'merge':
+                fates[branch] = f"merged into {other} at N={steps}"
+            elif kind == 'vanish':
+                fates[branch] = f"vanished at N={steps}"
+
+        lines = [f"{'BRANCH':<7} | {'N RANGE':<11} | {'BEST N':<6} | {'BEND':<9} | {'GAP':<8} | FATE",
+                 "-" * 72]
+        for branch in np.unique(table['branch']):
+            rows = table[table['branch'] == branch]
+            best = rows[np.argmin(rows['gap'])]
+            lines.append(f"{branch:<7} | {rows['steps'][0]:>4} - {rows['steps'][-1]:<4} | {best['steps']:<6} | "
+                         f"{best['theta']:<9.5f} | {best['gap']:<8.4f} | {fates.get(int(branch), 'alive')}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import time
+
+    from resonance import find_resonances
+
+    masses = range(100, 401)
+    tracker = BranchTracker()
+    start = time.perf_counter()
+    tracker.run(masses)
+    elapsed = time.perf_counter() - start
+
+    print(f"--- RESONANCE BRANCHES (Mass {masses[0]} - {masses[-1]}) ---")
+    print(tracker.summary())
+    print(f"\n{len(tracker.events)} events | {tracker.chain_builds} chain builds | {elapsed:.2f} s")
+
+    # Against the independent per-mass search
+    best = tracker.best_per_step()
+    start = time.perf_counter()
+    agree = 0
+    for row in best:
+        estimate = 21.0 / row['steps']
+        theta, gap = find_resonances(int(row['steps']), estimate * 0.5, estimate * 1.5)[0]
+        agree += abs(gap - row['gap']) < 1e-6
+    print(f"Per-mass search agrees on {agree}/{len(best)} masses | {time.perf_counter() - start:.2f} s")
+
+    # A fixed wide window exposes the families the 21/N window never sees
+    tracker = BranchTracker(window=lambda steps: (0.01, 0.3), coarse=64)
+    tracker.run(masses)
+    print(f"\n--- EVERY BRANCH IN BEND 0.01 - 0.3 ---")
+    print(tracker.summary())
+    kinds = [kind for _, kind, _, _ in tracker.events]
+    print(f"{kinds.count('appear')} appeared, {kinds.count('merge')} merged, {kinds.count('vanish')} vanished")
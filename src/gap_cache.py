@@ -0,0 +1,243 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from trixle_core import HINGE_RULES, KERNEL_VERSION, batch_gaps, chain_gap
+
+try:
+    import fcntl
+except ImportError:  # No advisory locks (Windows): safe for one process only
+    fcntl = None
+
+# Where scanners share their results: results/ at the top of the repository,
+# wherever the script is run from. Set TRIXLE_GAP_CACHE to another file, or
+# to an empty string to switch the cache off.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'results', 'gap_cache.bin')
+
+MAGIC = b'TRXGAP01'
+
+# One fixed-size little-endian record per computed gap (32 bytes)
+RECORD = np.dtype([
+    ('steps', '<u8'),
+    ('theta_bits', '<u8'),
+    ('hinge', 'u1'),
+    ('pad', 'V3'),
+    ('version', '<u4'),
+    ('gap', '<f8')
+])
+
+
+class GapCache:
+    """
+    Content-addressed store of closure gaps shared by every scanner.
+
+    A gap is keyed by the step count, the exact bit pattern of the bend
+    factor, the hinge rule and the kernel version tag. The scalar and the
+    batched kernels share entries: they agree to rounding, not bit for bit,
+    so a cached gap may differ from a fresh one in the last few bits. Only
+    chains with one hinge rule throughout are cached.
+    The file is an append-only log of fixed-size binary records. Writers
+    append under an exclusive lock and readers pick up new records from
+    their last offset, so several processes can share it. In memory the
+    entries are kept in LRU order and capped at `max_entries`. When the log
+    grows to twice the cap it is rewritten with only the live entries.
+    """
+    def __init__(self, path=DEFAULT_PATH, max_entries=1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._offset = 0
+        self._inode = None
+        self._disk_records = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'ab') as f:
+            self._lock(f, exclusive=True)
+            if f.tell() == 0:
+                f.write(MAGIC)
+
+    @staticmethod
+    def key(steps, bend_factor, hinge='edge'):
+        theta_bits = int(np.float64(bend_factor).view(np.uint64))
+        return (int(steps), theta_bits, _hinge_code(hinge), KERNEL_VERSION)
+
+    def get(self, steps, bend_factor, hinge='edge'):
+        """ Cached gap, or None if nobody has computed it yet. """
+        return self.get_many(steps, [bend_factor], hinge)[0]
+
+    def get_many(self, steps, bend_factors, hinge='edge'):
+        """ Cached gaps for one step count, None where missing. """
+        self._refresh()
+        found = []
+        for theta in bend_factors:
+            key = self.key(steps, theta, hinge)
+            gap = self.entries.get(key)
+            if gap is not None:
+                self.entries.move_to_end(key)
+            found.append(gap)
+        return found
+
+    def put(self, steps, bend_factor, gap, hinge='edge'):
+        self.put_many(steps, [bend_factor], [gap], hinge)
+
+    def put_many(self, steps, bend_factors, gaps, hinge='edge'):
+        """ Appends a batch of gaps for one step count in a single write. """
+        records = np.zeros(len(gaps), dtype=RECORD)
+        records['steps'] = steps
+        records['theta_bits'] = np.asarray(bend_factors, dtype=np.float64).view(np.uint64)
+        records['hinge'] = _hinge_code(hinge)
+        records['version'] = KERNEL_VERSION
+        records['gap'] = gaps
+
+        with open(self.path, 'rb+') as f:
+            self._lock(f, exclusive=True)
+            if os.fstat(f.fileno()).st_ino != self._inode:
+                self._reset(os.fstat(f.fileno()).st_ino)
+            # Catch up on other writers first, then our records sit at the end
+            self._read_new(f)
+            f.seek(0, os.SEEK_END)
+            f.write(records.tobytes())
+            self._offset = f.tell()
+        self._apply(records)
+
+        if self._disk_records > 2 * self.max_entries:
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrites the log with only the entries still held in memory.
+        An append racing the swap can be lost, which only costs a recompute.
+        """
+        with open(self.path, 'rb+') as f:
+            self._lock(f, exclusive=True)
+            self._read_new(f)
+
+            records = np.zeros(len(self.entries), dtype=RECORD)
+            if self.entries:
+                keys = np.array(list(self.entries.keys()), dtype=np.uint64)
+                records['steps'] = keys[:, 0]
+                records['theta_bits'] = keys[:, 1]
+                records['hinge'] = keys[:, 2]
+                records['version'] = keys[:, 3]
+                records['gap'] = list(self.entries.values())
+
+            # Swap the new file in atomically; readers notice the new inode
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as tmp:
+                tmp.write(MAGIC + records.tobytes())
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, self.path)
+
+        self._inode = None
+        self._refresh()
+
+    def __len__(self):
+        self._refresh()
+        return len(self.entries)
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # The log was compacted (or replaced): start over
+            self._reset(stat.st_ino)
+        elif stat.st_size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            self._lock(f, exclusive=False)
+            self._read_new(f)
+
+    def _read_new(self, f):
+        start = max(self._offset, len(MAGIC))
+        f.seek(start)
+        data = f.read()
+        # Only whole records: a writer may be mid-append
+        usable = len(data) - len(data) % RECORD.itemsize
+        records = np.frombuffer(data[:usable], dtype=RECORD)
+        self._offset = start + usable
+        self._apply(records)
+
+    def _reset(self, inode):
+        self._inode = inode
+        self._offset = 0
+        self._disk_records = 0
+
+    def _apply(self, records):
+        self._disk_records += len(records)
+        current = records[records['version'] == KERNEL_VERSION]
+        keys = zip(current['steps'].tolist(), current['theta_bits'].tolist(),
+                   current['hinge'].tolist(), current['version'].tolist())
+        for key, gap in zip(keys, current['gap'].tolist()):
+            self.entries[key] = gap
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _lock(f, exclusive):
+        # Released when the file is closed
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _hinge_code(hinge):
+    if not isinstance(hinge, str):
+        raise ValueError("The gap cache only keys chains with one hinge rule; "
+                         "compute per-step hinge chains directly")
+    if hinge not in HINGE_RULES:
+        raise ValueError(f"Unknown hinge rule {hinge!r}, expected one of {HINGE_RULES}")
+    return HINGE_RULES.index(hinge)
+
+
+_default_cache = None
+
+def default_cache():
+    """ The shared cache named by TRIXLE_GAP_CACHE (None when switched off). """
+    global _default_cache
+    path = os.environ.get('TRIXLE_GAP_CACHE', DEFAULT_PATH)
+    if not path:
+        return None
+    if _default_cache is None or _default_cache.path != path:
+        _default_cache = GapCache(path)
+    return _default_cache
+
+
+def cached_gap(steps, bend_factor, hinge='edge', cache=None):
+    """ chain_gap, looked up in (and added to) the shared cache. Per-step hinge rules skip it. """
+    if cache is None and isinstance(hinge, str):
+        cache = default_cache()
+    if cache is None:
+        return chain_gap(steps, bend_factor, hinge)
+
+    gap = cache.get(steps, bend_factor, hinge)
+    if gap is None:
+        gap = chain_gap(steps, bend_factor, hinge)
+        cache.put(steps, bend_factor, gap, hinge)
+    return gap
+
+
+def cached_batch_gaps(steps, bend_factors, hinge='edge', cache=None):
+    """ batch_gaps that only builds the chains missing from the cache. Per-step hinge rules skip it. """
+    if cache is None and isinstance(hinge, str):
+        cache = default_cache()
+    thetas = np.asarray(bend_factors, dtype=float)
+    if cache is None:
+        return batch_gaps(steps, thetas, hinge)
+
+    flat = thetas.ravel()
+    found = cache.get_many(steps, flat.tolist(), hinge)
+    gaps = np.array([np.nan if g is None else g for g in found])
+
+    missing = np.flatnonzero(np.isnan(gaps))
+    if len(missing):
+        gaps[missing] = batch_gaps(steps, flat[missing], hinge)
+        cache.put_many(steps, flat[missing], gaps[missing], hinge)
+    return gaps.reshape(thetas.shape)
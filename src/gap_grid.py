@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+
+from trixle_core import KERNEL_VERSION, batch_prefix_gaps, hinge_mask
+
+# results/ at the top of the repository, wherever the script is run from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'results', 'gap_grid.npy')
+
+
+class GapGrid:
+    """
+    Memory-mapped closure gaps over a full grid of step counts x bend factors.
+
+    Row r holds step_counts[r] and column c bend_factors[c]. The grid is
+    filled in tiles of `tile_size` bend factors: every tile walks its chains
+    once to the largest N and reads every shorter N on the way, then is
+    flushed and flagged done. An interrupted fill resumes at the first
+    unfinished tile. The axes, hinge rule and kernel version are kept next
+    to the grid, and reopening with different ones raises instead of mixing
+    results. Gaps are stored as float32; unfilled cells are NaN.
+    """
+    def __init__(self, step_counts, bend_factors, hinge='edge', path=DEFAULT_PATH, tile_size=4096):
+        self.step_counts = np.asarray(step_counts, dtype=np.int64)
+        self.bend_factors = np.asarray(bend_factors, dtype=np.float64)
+        self.hinge = hinge
+        self.path = path
+        self.tile_size = int(tile_size)
+        hinge_mask(hinge, int(self.step_counts.max()))
+
+        stem = path[:-4] if path.endswith('.npy') else path
+        self.axes_path = stem + '.axes.npz'
+        self.done_path = stem + '.done.npy'
+        tiles = -(-len(self.bend_factors) // self.tile_size)
+
+        if os.path.exists(path):
+            missing = [sidecar for sidecar in (self.axes_path, self.done_path) if not os.path.exists(sidecar)]
+            if missing:
+                raise ValueError(f"{path} is missing {', '.join(missing)}; remove it or choose another path")
+            self._check_axes()
+            self.gaps = np.load(path, mmap_mode='r+')
+            self.done = np.load(self.done_path, mmap_mode='r+')
+            if len(self.done) != tiles:
+                raise ValueError(f"{path} was tiled differently ({len(self.done)} tiles, not {tiles})")
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(self.axes_path, step_counts=self.step_counts, bend_factors=self.bend_factors,
+                 hinge=np.asarray(hinge), kernel_version=KERNEL_VERSION)
+        self.gaps = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32,
+                                              shape=(len(self.step_counts), len(self.bend_factors)))
+        self.gaps[:] = np.nan
+        self.gaps.flush()
+        self.done = np.lib.format.open_memmap(self.done_path, mode='w+', dtype=np.uint8, shape=(tiles,))
+
+    def _check_axes(self):
+        saved = np.load(self.axes_path)
+        if int(saved['kernel_version']) != KERNEL_VERSION:
+            raise ValueError(f"{self.path} was built by kernel version {int(saved['kernel_version'])}")
+        if (not np.array_equal(saved['step_counts'], self.step_counts)
+                or not np.array_equal(saved['bend_factors'], self.bend_factors)
+                or saved['hinge'].tolist() != np.asarray(self.hinge).tolist()):
+            raise ValueError(f"{self.path} holds a different grid; remove it or choose another path")
+
+    @property
+    def complete(self):
+        return bool(self.done.all())
+
+    def fill(self, progress=True):
+        """ Computes every unfinished tile. Safe to interrupt and rerun. """
+        todo = np.flatnonzero(self.done == 0)
+        if progress:
+            print(f"--- GAP GRID {len(self.step_counts)} x {len(self.bend_factors)} ---")
+            print(f"{len(self.done) - len(todo)} tiles already done, {len(todo)} to go")
+
+        block = np.empty((len(self.step_counts), self.tile_size))
+        for count, t in enumerate(todo, 1):
+            lo = t * self.tile_size
+            thetas = self.bend_factors[lo:lo + self.tile_size]
+            out = block[:, :len(thetas)]
+            batch_prefix_gaps(self.step_counts, thetas, self.hinge, out=out)
+
+            # The data reaches the disk before its tile is flagged
+            self.gaps[:, lo:lo + len(thetas)] = out
+            self.gaps.flush()
+            self.done[t] = 1
+            self.done.flush()
+            if progress:
+                print(f"  ...tile {count}/{len(todo)} | bend {thetas[0]:.5f} - {thetas[-1]:.5f}")
+
+    def downsample(self, max_rows=1000, max_cols=1000, row_block=256):
+        """
+        The grid reduced to at most max_rows x max_cols cells, each the
+        smallest gap of the block it covers, so a narrow resonance ridge
+        survives the reduction. The memmap is read a band of rows at a time.
+        Returns (gaps, step_edges, bend_edges), the edges indexing the full axes.
+        """
+        n_rows, n_cols = self.gaps.shape
+        row_edges = np.linspace(0, n_rows, min(max_rows, n_rows) + 1).astype(int)
+        col_edges = np.linspace(0, n_cols, min(max_cols, n_cols) + 1).astype(int)
+
+        starts = row_edges[:-1]
+        small = np.empty((len(starts), len(col_edges) - 1), dtype=np.float32)
+        for lo in range(0, len(starts), row_block):
+            first, last = starts[lo], row_edges[min(lo + row_block, len(starts))]
+            band = np.fmin.reduceat(self.gaps[first:last], col_edges[:-1], axis=1)
+            small[lo:lo + row_block] = np.fmin.reduceat(band, starts[lo:lo + row_block] - first, axis=0)
+        return small, row_edges, col_edges
+
+    def plot(self, save_path=None, max_rows=1000, max_cols=1000, show=False):
+        """ Heatmap of log10(gap) over (bend, N), downsampled by block minimum. """
+        import matplotlib.pyplot as plt
+
+        small, row_edges, col_edges = self.downsample(max_rows, max_cols)
+        fig, ax = plt.subplots(figsize=(10, 7))
+        with np.errstate(divide='ignore'):
+            image = ax.imshow(np.log10(small), origin='lower', aspect='auto', cmap='magma',
+                              extent=[self.bend_factors[0], self.bend_factors[-1],
+                                      self.step_counts[0], self.step_counts[-1]])
+        fig.colorbar(image, ax=ax, label='log10 Closure Gap (block minimum)')
+        ax.set_xlabel('Bend Factor (rad)')
+        ax.set_ylabel('Lattice Steps (N)')
+        ax.set_title(f'Resonance Ridges: {len(self.step_counts)} x {len(self.bend_factors)} chains '
+                     f'({self.hinge} hinge)')
+        fig.tight_layout()
+        if save_path is not None:
+            fig.savefig(save_path, dpi=150)
+            print(f"Heatmap saved to {save_path}")
+        if show:
+            plt.show()
+        return fig
+
+
+if __name__ == "__main__":
+    import time
+
+    # Every N up to 2000 against 4096 bends: the 21/N ridge and its harmonics
+    grid = GapGrid(np.arange(1, 2001), np.linspace(0.002, 0.3, 4096))
+    start = time.perf_counter()
+    grid.fill()
+    print(f"Filled in {time.perf_counter() - start:.1f} s")
+
+    # The best closure on every row, read from the grid
+    best = np.nanargmin(grid.gaps, axis=1)
+    for n in (122, 136, 1836):
+        r = n - 1
+        print(f"N={n:<5} | best bend on grid: {grid.bend_factors[best[r]]:.5f} | gap {grid.gaps[r, best[r]]:.4f}")
+    grid.plot(os.path.join(os.path.dirname(DEFAULT_PATH), 'gap_grid.png'))
@@ -0,0 +1,76 @@
+import numpy as np
+
+from trixle_core import SEED_TETRAHEDRON, face_normals, tetra_centers, tetra_windows
+
+# Edge length of the regular seed tetrahedron (2 * sqrt(2))
+SEED_EDGE = float(np.linalg.norm(SEED_TETRAHEDRON[0] - SEED_TETRAHEDRON[1]))
+
+# The six edges of a tetrahedron as (vertex, vertex) offsets
+EDGE_PAIRS = ([0, 0, 0, 1, 1, 2], [1, 2, 3, 2, 3, 3])
+
+
+def curvature(vertices):
+    """
+    Discrete curvature of the centerline through the tetrahedron centers:
+    turning angle at each center divided by the mean length of the two
+    segments meeting there. The two end centers copy their neighbour.
+    """
+    centers = tetra_centers(vertices)
+    seg = np.diff(centers, axis=0)
+    lengths = np.linalg.norm(seg, axis=1)
+    cos_turn = np.einsum('ij,ij->i', seg[:-1], seg[1:]) / (lengths[:-1] * lengths[1:])
+    kappa = np.arccos(np.clip(cos_turn, -1.0, 1.0)) / (0.5 * (lengths[:-1] + lengths[1:]))
+    if len(kappa) == 0:
+        return np.zeros(len(centers))
+    return np.concatenate([kappa[:1], kappa, kappa[-1:]])
+
+
+def face_torsion(vertices):
+    """
+    Angle (degrees) each tetrahedron turns its exposed face through: the
+    normal of its entry face (j, j+1, j+2) against its exit face (j+1, j+2, j+3).
+    """
+    normals = face_normals(vertices)
+    dots = np.einsum('ij,ij->i', normals[:-1], normals[1:])
+    return np.degrees(np.arccos(np.clip(dots, -1.0, 1.0)))
+
+
+def edge_strain(vertices):
+    """ Largest relative deviation of each tetrahedron's six edges from the seed edge. """
+    windows = tetra_windows(vertices)
+    lengths = np.linalg.norm(windows[:, EDGE_PAIRS[0]] - windows[:, EDGE_PAIRS[1]], axis=-1)
+    return np.abs(lengths / SEED_EDGE - 1.0).max(axis=1)
+
+
+def centroid_distance(vertices):
+    """ Distance of each tetrahedron center from the centroid of the whole chain. """
+    centers = tetra_centers(vertices)
+    return np.linalg.norm(centers - vertices.mean(axis=0), axis=1)
+
+
+def step_metrics(vertices):
+    """ Every per-tetrahedron metric, each a (steps + 1,) array. """
+    return {
+        'curvature': curvature(vertices),
+        'torsion': face_torsion(vertices),
+        'edge_strain': edge_strain(vertices),
+        'centroid_distance': centroid_distance(vertices)
+    }
+
+
+def arc_fraction(points):
+    """ Cumulative arc length along a polyline, scaled to run from 0 to 1. """
+    s = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+    return s / s[-1] if s[-1] > 0 else s
+
+
+def map_to_curve(values, vertices, curve_points):
+    """
+    Resamples per-tetrahedron values onto the points of a curve through the
+    vertices (e.g. a pv.Spline). Tetrahedron j sits at the mean arc-length
+    fraction of its four vertices and the curve points are matched to it
+    by their own arc-length fraction.
+    """
+    s = arc_fraction(vertices)
+    node_s = tetra_centers(s)
+    return np.interp(arc_fraction(curve_points), node_s, values)
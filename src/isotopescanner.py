@@ -1,81 +1,57 @@
-import numpy as np
-import pyvista as pv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from branch_tracker import BranchTracker
+from resonance import find_resonances
 
 class IsotopeScanner:
-    def __init__(self):
+    def __init__(self, workers=1, chunk_size=4):
         self.results = []
-
-    def get_closure_error(self, steps, bend_factor):
-        # FAST GENERATOR (No cell data, just vertices)
-        # We assume the "Hinge" logic we validated earlier
-        vertices = [np.array([1.,1.,1.]), np.array([1.,-1.,-1.]), np.array([-1.,1.,-1.]), np.array([-1.,-1.,1.])]
-        
-        # Pre-calculate hinge vectors for standard orientation to speed up? 
-        # No, geometry changes every step. Must compute loop.
-        
-        for i in range(steps):
-            last_three_indices = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three_indices]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            direction = old_vertex - face_center
-            
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = bend_factor
-            
-            # Rotation
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        start_pt = np.mean(vertices[:4], axis=0)
-        end_pt = np.mean(vertices[-4:], axis=0)
-        return np.linalg.norm(end_pt - start_pt)
+        # Every mass is independent, so the sweep can be spread over processes
+        self.workers = workers
+        self.chunk_size = chunk_size
 
     def optimize_mass(self, steps):
         # We know Bend ~ 21/Steps based on Electron data
-        # We search a tight window around that estimation
+        # We search a tight window around that estimation:
+        # a coarse batched pass brackets the minima, refine_minima closes in on
+        # all of them together using the gap derivative
         estimate = 21.0 / steps
-        search_window = np.linspace(estimate * 0.5, estimate * 1.5, 40)
-        
-        best_gap = float('inf')
-        
-        # Coarse Scan
-        for factor in search_window:
-            gap = self.get_closure_error(steps, factor)
-            if gap < best_gap:
-                best_gap = gap
-                best_factor = factor
-        
-        # Fine Scan (Zoom in on the best result)
-        fine_window = np.linspace(best_factor * 0.95, best_factor * 1.05, 20)
-        for factor in fine_window:
-            gap = self.get_closure_error(steps, factor)
-            if gap < best_gap:
-                best_gap = gap
+        resonances = find_resonances(steps, estimate * 0.5, estimate * 1.5)
         
+        best_factor, best_gap = resonances[0]
         return best_gap
 
-    def run_sweep(self):
-        print("--- INITIATING DARK MATTER SWEEP (Mass 80 - 250) ---")
+    def run_sweep(self, mass_range=range(80, 251)):
+        print(f"--- INITIATING DARK MATTER SWEEP (Mass {mass_range[0]} - {mass_range[-1]}) ---")
         print("Searching for stable resonant loops...")
         
-        # Sweep range
-        mass_range = range(80, 251)
-        
-        for mass in mass_range:
-            gap = self.optimize_mass(mass)
-            self.results.append((mass, gap))
-            
-            # Visual heartbeat
-            if mass % 10 == 0:
-                print(f"  Scanning Mass {mass}... (Gap: {gap:.2f})")
+        if self.workers > 1:
+            print(f"Spreading masses over {self.workers} processes (chunks of {self.chunk_size})...")
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # pool.map hands results back in mass order
+                self._collect(mass_range, pool.map(self.optimize_mass, mass_range, chunksize=self.chunk_size))
+        else:
+            self._collect(mass_range, map(self.optimize_mass, mass_range))
+        self._report()
+
+    def track_sweep(self, mass_range=range(80, 251), rescan_every=10):
+        # Instead of a blind search per mass, follow every resonance branch
+        # from one mass to the next, starting each from where it was.
+        # A minimum no branch follows only shows up at a rescan, so the
+        # best loop per mass matches run_sweep only with rescan_every=1
+        print(f"--- TRACKING RESONANCE BRANCHES (Mass {mass_range[0]} - {mass_range[-1]}) ---")
+        tracker = BranchTracker(rescan_every=rescan_every)
+        tracker.run(mass_range)
+        print(tracker.summary())
+        print(f"({tracker.chain_builds} chain builds, {tracker.chain_builds / len(mass_range):.1f} per mass)\n")
+
+        best = tracker.best_per_step()
+        self._collect(best['steps'].tolist(), best['gap'].tolist())
+        self._report()
+        return tracker
 
+    def _report(self):
         # SORT BY STABILITY (Lowest Gap)
         self.results.sort(key=lambda x: x[1])
         
@@ -83,8 +59,7 @@ class IsotopeScanner:
         print(f"{'MASS':<10} | {'CLOSURE ERROR':<15} | {'STATUS'}")
         print("-" * 40)
         
-        for i in range(15): # Show top 15
-            mass, gap = self.results[i]
+        for mass, gap in self.results[:15]: # Show top 15
             status = "STABLE" if gap < 0.5 else "UNSTABLE"
             print(f"{mass:<10} | {gap:<15.4f} | {status}")
 
@@ -93,6 +68,14 @@ class IsotopeScanner:
         self.check_mass(104)
         self.check_mass(204)
         
+    def _collect(self, mass_range, gaps):
+        for mass, gap in zip(mass_range, gaps):
+            self.results.append((mass, gap))
+            
+            # Visual heartbeat
+            if mass % 10 == 0:
+                print(f"  Scanning Mass {mass}... (Gap: {gap:.2f})")
+
     def check_mass(self, target):
         # Find the specific result for a target mass
         for m, g in self.results:
@@ -101,5 +84,5 @@ class IsotopeScanner:
                 print(f"Mass {target}: Gap {g:.4f} -> {status}")
 
 if __name__ == "__main__":
-    scanner = IsotopeScanner()
+    scanner = IsotopeScanner(workers=os.cpu_count() or 1)
     scanner.run_sweep()
\ No newline at end of file
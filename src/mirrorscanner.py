@@ -1,43 +1,13 @@
 import numpy as np
-import pyvista as pv
+
+from gap_cache import cached_batch_gaps
+from resonance import gap_slopes, refine_minima
+from trixle_core import batch_gaps
 
 class ChiralityTest:
     def __init__(self):
         self.steps = 1836
         
-    def generate_lattice(self, bend_factor):
-        # Standard Hinge Logic
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
-        
-        for i in range(self.steps):
-            last_three_indices = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three_indices]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            direction = old_vertex - face_center
-            
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            # THE VARIABLE: Positive or Negative Bend
-            theta = bend_factor
-            
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        start_pt = np.mean(vertices[:4], axis=0)
-        end_pt = np.mean(vertices[-4:], axis=0)
-        return np.linalg.norm(end_pt - start_pt)
-
     def run_comparison(self):
         print("--- CHIRALITY TEST (MATTER VS ANTIMATTER) ---")
         
@@ -45,11 +15,13 @@ class ChiralityTest:
         print("\nScanning MATTER (Right-Handed Twist)...")
         # We look around the known proton value (0.015)
         pos_range = np.linspace(0.010, 0.020, 100)
+        # ...and at the exact MIRROR range (-0.010 to -0.020): both go through the kernel together
+        neg_range = -pos_range
+        gaps = cached_batch_gaps(self.steps, np.concatenate([pos_range, neg_range]))
         best_pos_gap = float('inf')
         best_pos_val = 0
         
-        for f in pos_range:
-            gap = self.generate_lattice(f)
+        for f, gap in zip(pos_range, gaps[:len(pos_range)]):
             if gap < best_pos_gap:
                 best_pos_gap = gap
                 best_pos_val = f
@@ -60,13 +32,10 @@ class ChiralityTest:
 
         # 2. Scan ANTIMATTER (Negative Bend)
         print("\nScanning ANTIMATTER (Left-Handed Twist)...")
-        # We look at the exact MIRROR range (-0.010 to -0.020)
-        neg_range = np.linspace(-0.010, -0.020, 100)
         best_neg_gap = float('inf')
         best_neg_val = 0
         
-        for f in neg_range:
-            gap = self.generate_lattice(f)
+        for f, gap in zip(neg_range, gaps[len(pos_range):]):
             if gap < best_neg_gap:
                 best_neg_gap = gap
                 best_neg_val = f
@@ -88,5 +57,100 @@ class ChiralityTest:
         else:
             print(">>> INCONCLUSIVE result.")
 
+    def scan_both(self, lo=0.010, hi=0.020, points=100001):
+        """
+        Gap curves of both handedness branches: +theta and -theta over
+        |theta| in [lo, hi], all 2 x points chains advanced in one batched pass.
+        Returns (bends, matter_gaps, antimatter_gaps), bends being the magnitudes.
+        """
+        bends = np.linspace(lo, hi, points)
+        gaps = batch_gaps(self.steps, np.concatenate([bends, -bends]))
+        return bends, gaps[:points], gaps[points:]
+
+    def analyze(self, lo=0.010, hi=0.020, points=100001, levels=None, save_path=None):
+        """
+        Asymmetry between the best matter and antimatter loops, with estimated bounds.
+
+        One scan at the finest grid. With points = 10^k + 1, every tenfold
+        coarser grid is a strided subset of it, so the asymmetry ratio is
+        read at each resolution without any new chains. By default `levels`
+        runs down to the coarsest grid that still has 101 points; the
+        coarsest grid must have at least 11. At grid spacing h, the true
+        minimum of a curve whose slope never exceeds L lies within L * h / 2
+        below its lowest sample. L is estimated from the finest grid, so the
+        bounds on each side's minimum, and on the ratio, are estimates: a dip
+        narrower than the finest spacing can still fall outside them. Finally
+        both minima are refined together with the gap derivative.
+        """
+        if levels is None:
+            levels = max(int(np.log10(max(points - 1, 1))) - 1, 1)
+        if points < 10 ** levels + 1:
+            raise ValueError(f"{levels} levels need at least {10 ** levels + 1} points, got {points}")
+
+        bends, pos, neg = self.scan_both(lo, hi, points)
+        h_fine = bends[1] - bends[0]
+        slope = {'matter': np.abs(np.diff(pos)).max() / h_fine,
+                 'antimatter': np.abs(np.diff(neg)).max() / h_fine}
+
+        print(f"--- CHIRALITY ANALYSIS (N={self.steps}, |bend| {lo} - {hi}) ---")
+        print(f"{'POINTS':>8} | {'MATTER GAP [EST. BOUNDS]':<29} | {'ANTIMATTER GAP [EST. BOUNDS]':<29} | "
+              f"RATIO [EST. BOUNDS]")
+        levels_out = []
+        for level in range(levels - 1, -1, -1):
+            stride = 10 ** level
+            x = bends[::stride]
+            h = x[1] - x[0]
+            row = {'points': len(x)}
+            for name, curve in (('matter', pos), ('antimatter', neg)):
+                sampled = curve[::stride]
+                i = int(np.argmin(sampled))
+                row[name] = (x[i], sampled[i], max(sampled[i] - slope[name] * h / 2, 0.0))
+            (_, p, p_lo), (_, n, n_lo) = row['matter'], row['antimatter']
+            row['ratio'] = n / p
+            row['bounds'] = (n_lo / p, n / p_lo if p_lo > 0 else np.inf)
+            levels_out.append(row)
+            print(f"{len(x):>8} | {p:8.4f} [{p_lo:8.4f}, {p:8.4f}] | {n:8.4f} [{n_lo:8.4f}, {n:8.4f}] | "
+                  f"{row['ratio']:.3f} [{row['bounds'][0]:.3f}, {row['bounds'][1]:.3f}]")
+
+        # Both finest-grid minima refined in one batched derivative search
+        x0 = np.array([row['matter'][0], -row['antimatter'][0]])
+        refined, refined_gaps, _ = refine_minima(lambda t: gap_slopes(self.steps, t), x0 - h_fine, x0 + h_fine,
+                                                 x0)
+        ratio = refined_gaps[1] / refined_gaps[0]
+        print(f"Refined: matter bend {refined[0]:.8f} gap {refined_gaps[0]:.6f} | "
+              f"antimatter bend {refined[1]:.8f} gap {refined_gaps[1]:.6f} | ratio {ratio:.4f}")
+
+        if save_path is not None:
+            self.plot_curves(bends, pos, neg, save_path)
+        return {'bends': bends, 'matter': pos, 'antimatter': neg, 'levels': levels_out,
+                'minima': refined, 'min_gaps': refined_gaps, 'ratio': ratio}
+
+    def plot_curves(self, bends, pos, neg, save_path):
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.semilogy(bends, pos, color='blue', linewidth=0.8, label='Matter (+bend)')
+        ax.semilogy(bends, neg, color='red', linewidth=0.8, label='Antimatter (-bend)')
+        for curve, color in ((pos, 'blue'), (neg, 'red')):
+            i = int(np.argmin(curve))
+            ax.plot(bends[i], curve[i], 'o', color=color)
+        ax.set_xlabel('|Bend Factor| (rad)')
+        ax.set_ylabel('Closure Gap')
+        ax.set_title(f'Chirality: Gap Curves of Both Handedness Branches (N={self.steps})')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        fig.savefig(save_path, dpi=150)
+        plt.close(fig)
+        print(f"Gap curves saved to {save_path}")
+
 if __name__ == "__main__":
-    ChiralityTest().run_comparison()
\ No newline at end of file
+    import time
+
+    test = ChiralityTest()
+    test.run_comparison()
+
+    start = time.perf_counter()
+    print()
+    test.analyze(save_path='results/chirality_gap_curves.png')
+    print(f"Analysis in {time.perf_counter() - start:.1f} s")
\ No newline at end of file
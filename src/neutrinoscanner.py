@@ -1,4 +1,4 @@
-import numpy as np
+from trixle_core import closure_gap_power, prefix_scan
 
 class NeutrinoScanner:
     def __init__(self):
@@ -6,36 +6,10 @@ class NeutrinoScanner:
         self.bend_factor = 0.0 
         
     def check_loop(self, steps):
-        vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
-        
         # Build the chain
-        for i in range(steps):
-            last_three = len(vertices) - np.array([3, 2, 1])
-            f_verts = [vertices[idx] for idx in last_three]
-            
-            old_vertex = vertices[len(vertices) - 4]
-            face_center = np.mean(f_verts, axis=0)
-            direction = old_vertex - face_center
-            edge_vector = f_verts[1] - f_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            # Neutrinos might be "Relaxed" (Zero Bend)
-            theta = 0.0 
-            
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            vertices.append(face_center - v_rot)
-            
-        start_center = np.mean(vertices[:4], axis=0)
-        end_center = np.mean(vertices[-4:], axis=0)
-        gap = np.linalg.norm(end_center - start_center)
+        # Neutrinos might be "Relaxed" (Zero Bend)
+        # A zero bend is the pure screw helix, so the gap comes from M**steps
+        gap = closure_gap_power(steps, self.bend_factor)
         
         return gap
 
@@ -44,8 +18,11 @@ class NeutrinoScanner:
         best_n = 0
         best_gap = 100
         
-        for n in range(3, 13):
-            gap = self.check_loop(n)
+        # All candidates are prefixes of the N=12 chain
+        ns = range(3, 13)
+        gaps, _ = prefix_scan(ns, self.bend_factor)
+        
+        for n, gap in zip(ns, gaps):
             print(f"N={n}: Gap {gap:.4f}")
             if gap < best_gap:
                 best_gap = gap
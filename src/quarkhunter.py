@@ -1,68 +1,46 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import pyvista as pv
+
+from structure_analysis import analyze_loop, lobe_map
+from trixle_core import generate_chain
 
 class QuarkScanner:
     def __init__(self):
         self.steps = 1836
         # The Proton Resonance we found earlier
         self.bend_factor = 0.01520 
-        self.vertices = []
+        self.vertices = None
+        self.report = None
         
     def generate_proton(self):
         print("Generating Proton Lattice...")
-        self.vertices = [
-            np.array([1.0, 1.0, 1.0]),
-            np.array([1.0, -1.0, -1.0]),
-            np.array([-1.0, 1.0, -1.0]),
-            np.array([-1.0, -1.0, 1.0])
-        ]
-        
-        for i in range(self.steps):
-            last_three_indices = len(self.vertices) - np.array([3, 2, 1])
-            face_verts = [self.vertices[idx] for idx in last_three_indices]
-            
-            old_vertex = self.vertices[len(self.vertices) - 4]
-            face_center = np.mean(face_verts, axis=0)
-            direction = old_vertex - face_center
-            
-            # Hinge Logic
-            edge_vector = face_verts[1] - face_verts[0]
-            k = edge_vector / np.linalg.norm(edge_vector)
-            
-            theta = self.bend_factor
-            
-            v_rot = (direction * np.cos(theta) + 
-                     np.cross(k, direction) * np.sin(theta) + 
-                     k * np.dot(k, direction) * (1 - np.cos(theta)))
-
-            new_vertex = face_center - v_rot 
-            self.vertices.append(new_vertex)
+        # Hinge Logic
+        self.vertices = generate_chain(self.steps, self.bend_factor)
 
     def analyze_structure(self):
         print("Analyzing Internal Structure...")
-        points = np.array(self.vertices)
         
-        # 1. Find the Center of Mass of the ring
-        center_of_mass = np.mean(points, axis=0)
+        # Distance of every point from the center of mass, smoothed round the
+        # closed loop to remove "Digital Jitter": we want to see the
+        # macro-shape, not the jagged triangle edges
+        self.report = analyze_loop(self.vertices, window=50)
         
-        # 2. Measure distance of every point from the center
-        distances = []
-        for p in points:
-            d = np.linalg.norm(p - center_of_mass)
-            distances.append(d)
-            
-        # 3. Smooth the data (Rolling average) to remove "Digital Jitter"
-        # We want to see the macro-shape, not the jagged triangle edges
-        window_size = 50
-        smoothed = np.convolve(distances, np.ones(window_size)/window_size, mode='valid')
+        # Lobes (quark clusters) and pinch points (gluon necks) are the
+        # peaks and troughs that stand out by at least 5% of the profile range
+        lobes, pinches = self.report['lobes'], self.report['pinches']
+        print(f"Lobes: {len(lobes)} at steps {lobes.tolist()}")
+        print(f"Pinch points: {len(pinches)} at steps {pinches.tolist()}")
         
-        return smoothed
+        return self.report['smoothed']
 
     def plot_quarks(self, data):
         # Setup the Graph
         plt.figure(figsize=(10, 6))
         plt.plot(data, color='blue', linewidth=2, label='Lattice Radius')
+        if self.report is not None:
+            lobes, pinches = self.report['lobes'], self.report['pinches']
+            plt.scatter(lobes, data[lobes], color='orange', zorder=3, label=f'Lobes ({len(lobes)})')
+            plt.scatter(pinches, data[pinches], color='black', marker='x', zorder=3, label=f'Pinch Points ({len(pinches)})')
         
         plt.title(f"Proton Internal Geometry (N={self.steps})")
         plt.xlabel("Lattice Step (0 - 1836)")
@@ -77,8 +55,28 @@ class QuarkScanner:
         print("Opening Analysis Graph...")
         plt.show()
 
+    def map_neighbourhood(self, step_span=50, bend_span=0.0015, resolution=51):
+        """ Lobe count over the (N, bend) neighbourhood of the proton, as a heatmap. """
+        steps = np.arange(self.steps - step_span, self.steps + step_span + 1)
+        bends = np.linspace(self.bend_factor - bend_span, self.bend_factor + bend_span, resolution)
+        print(f"Mapping lobes over {len(steps)} x {len(bends)} chains...")
+        lobes, _ = lobe_map(steps, bends)
+
+        plt.figure(figsize=(10, 6))
+        plt.imshow(lobes, origin='lower', aspect='auto', cmap='viridis',
+                   extent=[bends[0], bends[-1], steps[0], steps[-1]])
+        plt.colorbar(label='Lobe Count')
+        plt.scatter([self.bend_factor], [self.steps], color='red', marker='+', s=100, label='Proton')
+        plt.title("Lobe Count around the Proton Resonance")
+        plt.xlabel("Bend Factor")
+        plt.ylabel("Lattice Steps (N)")
+        plt.legend()
+        plt.show()
+        return lobes
+
 if __name__ == "__main__":
     scanner = QuarkScanner()
     scanner.generate_proton()
     structure_data = scanner.analyze_structure()
-    scanner.plot_quarks(structure_data)
\ No newline at end of file
+    scanner.plot_quarks(structure_data)
+    scanner.map_neighbourhood()
\ No newline at end of file
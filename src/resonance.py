@@ -0,0 +1,265 @@
+import math
+
+import numpy as np
+
+from gap_cache import cached_batch_gaps
+from trixle_core import (batch_gap_slopes, batch_gaps, batch_profile_gaps, chain_gap, chain_gap_slope,
+                         modulation_profiles)
+
+# Golden-section fraction used when the parabolic step is not trusted
+GOLDEN = 0.5 * (3.0 - math.sqrt(5.0))
+SQRT_EPS = math.sqrt(np.finfo(float).eps)
+
+# Below this many chains the scalar dual-number walk beats the batched one
+SCALAR_BATCH = 24
+
+
+def brent_minimize(func, lo, hi, tol=1e-7, max_iter=100, x0=None, f0=None):
+    """
+    Brent's bounded minimizer on [lo, hi]: parabolic steps where the curve
+    allows it, golden-section steps where it does not.
+
+    `x0, f0` seed the search with a point whose value is already known
+    (e.g. the best point of a coarse grid), saving one evaluation.
+    Returns (x, f(x), evaluations).
+    """
+    a, b = lo, hi
+    if x0 is None:
+        x0 = a + GOLDEN * (b - a)
+        f0 = func(x0)
+        evals = 1
+    else:
+        evals = 0
+    x = w = v = x0
+    fx = fw = fv = f0
+    d = e = 0.0
+
+    for _ in range(max_iter):
+        m = 0.5 * (a + b)
+        tol1 = SQRT_EPS * abs(x) + tol / 3.0
+        tol2 = 2.0 * tol1
+        if abs(x - m) <= tol2 - 0.5 * (b - a):
+            break
+
+        use_golden = True
+        if abs(e) > tol1:
+            # Fit a parabola through x, w, v
+            r = (x - w) * (fx - fv)
+            q = (x - v) * (fx - fw)
+            p = (x - v) * q - (x - w) * r
+            q = 2.0 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            r, e = e, d
+            if abs(p) < abs(0.5 * q * r) and q * (a - x) < p < q * (b - x):
+                d = p / q
+                u = x + d
+                if u - a < tol2 or b - u < tol2:
+                    d = tol1 if x < m else -tol1
+                use_golden = False
+        if use_golden:
+            e = (b - x) if x < m else (a - x)
+            d = GOLDEN * e
+
+        u = x + d if abs(d) >= tol1 else x + math.copysign(tol1, d)
+        fu = func(u)
+        evals += 1
+
+        if fu <= fx:
+            if u < x:
+                b = x
+            else:
+                a = x
+            v, fv, w, fw, x, fx = w, fw, x, fx, u, fu
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if fu <= fw or w == x:
+                v, fv, w, fw = w, fw, u, fu
+            elif fu <= fv or v == x or v == w:
+                v, fv = u, fu
+
+    return x, fx, evals
+
+
+def bracket_minima(xs, fs):
+    """
+    Indices of the local minima of a sampled curve, endpoints included when
+    they are lower than their only neighbour. Each minimum i is bracketed by
+    the grid points either side of it.
+    """
+    fs = np.asarray(fs)
+    left = np.r_[np.inf, fs[:-1]]
+    right = np.r_[fs[1:], np.inf]
+    return np.flatnonzero((fs <= left) & (fs < right))
+
+
+def find_minima(func, lo, hi, coarse=16, tol=1e-7, batch_func=None):
+    """
+    Every local minimum of func on [lo, hi].
+
+    A cheap coarse pass of `coarse` points brackets the candidates (using
+    `batch_func` on the whole grid at once when given) and each bracket is
+    refined with Brent's method to `tol`. Returns a list of (x, f(x)) sorted
+    from lowest to highest minimum. The scanners use find_resonances; this
+    value-only search is the reference the demo below compares it against.
+    """
+    xs = np.linspace(lo, hi, coarse)
+    fs = batch_func(xs) if batch_func is not None else np.array([func(x) for x in xs])
+
+    minima = []
+    for i in bracket_minima(xs, fs):
+        a = xs[max(i - 1, 0)]
+        b = xs[min(i + 1, coarse - 1)]
+        x, fx, _ = brent_minimize(func, a, b, tol=tol, x0=xs[i], f0=fs[i])
+        minima.append((x, fx))
+
+    minima.sort(key=lambda m: m[1])
+    return minima
+
+
+def chain_gaps(steps, bend_factors, hinge='edge'):
+    """ Closure gaps, through whichever kernel is quicker for the batch size. """
+    thetas = np.asarray(bend_factors, dtype=float)
+    if thetas.size > SCALAR_BATCH:
+        return batch_gaps(steps, thetas, hinge)
+    return np.array([chain_gap(steps, theta, hinge) for theta in thetas.ravel()]).reshape(thetas.shape)
+
+
+def gap_slopes(steps, bend_factors, hinge='edge'):
+    """ Closure gaps and their bend derivatives, through whichever kernel is quicker for the batch size. """
+    thetas = np.asarray(bend_factors, dtype=float)
+    if thetas.size > SCALAR_BATCH:
+        return batch_gap_slopes(steps, thetas, hinge)
+    pairs = [chain_gap_slope(steps, theta, hinge) for theta in thetas.ravel()]
+    gaps, slopes = np.array(pairs).reshape(-1, 2).T
+    return gaps.reshape(thetas.shape), slopes.reshape(thetas.shape)
+
+
+def refine_minima(func, lo, hi, x0, tol=1e-7, max_iter=50):
+    """
+    Every bracketed minimum refined together, using the derivative.
+    `func(xs)` returns (f, f') for a vector of points. Each bracket [lo, hi]
+    holds a point x0 lower than both ends.
+
+    Each round steps to the minimum of the cubic Hermite interpolant through
+    (f, f') at the best point and the last one evaluated, or takes a secant
+    step on f' where that cubic has no minimum. When the step would leave
+    the bracket or go uphill, it bisects the downhill half instead. Every active bracket is evaluated in
+    one call, and brackets shrink the way Brent's do, so a minimum is never
+    lost. Returns (xs, f(xs), calls).
+    """
+    a, b = np.array(lo, dtype=float), np.array(hi, dtype=float)
+    x = np.array(x0, dtype=float)
+    fx, sx = func(x)
+    # No second point yet: the first step bisects
+    w, fw, sw = x.copy(), fx.copy(), sx.copy()
+    active = np.ones(x.shape, dtype=bool)
+
+    calls = 1
+    while active.any() and calls < max_iter:
+        idx = np.flatnonzero(active)
+        ai, bi, xi, si = a[idx], b[idx], x[idx], sx[idx]
+        wi, swi = w[idx], sw[idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Minimum of the cubic through (f, f') at x and w; the secant on f' where it has none
+            d1 = si + swi - 3.0 * (fx[idx] - fw[idx]) / (xi - wi)
+            d2 = np.sign(wi - xi) * np.sqrt(d1 * d1 - si * swi)
+            u = wi - (wi - xi) * (swi + d2 - d1) / (swi - si + 2.0 * d2)
+            secant = xi - si * (xi - wi) / (si - swi)
+        u = np.where(np.isfinite(u), u, secant)
+        downhill = np.where(si < 0, 0.5 * (xi + bi), 0.5 * (ai + xi))
+        margin = SQRT_EPS * np.abs(xi) + tol / 3.0
+        ok = (u > ai + margin) & (u < bi - margin) & ((u - xi) * si < 0)
+        u = np.where(ok, u, downhill)
+
+        fu, su = func(u)
+        calls += 1
+
+        lower = fu <= fx[idx]
+        # Brent's bracket update: the better point becomes x, the worse one a bracket end
+        a[idx] = np.where(lower, np.where(u >= xi, xi, ai), np.where(u < xi, u, ai))
+        b[idx] = np.where(lower, np.where(u >= xi, bi, xi), np.where(u < xi, bi, u))
+        w[idx] = np.where(lower, xi, u)
+        fw[idx] = np.where(lower, fx[idx], fu)
+        sw[idx] = np.where(lower, si, su)
+        x[idx] = np.where(lower, u, xi)
+        fx[idx] = np.where(lower, fu, fx[idx])
+        sx[idx] = np.where(lower, su, si)
+
+        active[idx] = (np.abs(u - xi) > margin) & (b[idx] - a[idx] > 2 * margin) & (su != 0)
+    return x, fx, calls
+
+
+def find_resonances(steps, lo, hi, coarse=16, tol=1e-7, hinge='edge'):
+    """
+    Every bend factor in [lo, hi] where an N-step chain locally closes best.
+    A cheap coarse pass through the batched kernel (and the shared cache)
+    brackets the candidates. All brackets are then refined
+    together with derivative steps (refine_minima), which takes a handful
+    of chain builds. Returns (bend, gap) pairs, best first.
+    """
+    xs = np.linspace(lo, hi, coarse)
+    gaps = cached_batch_gaps(steps, xs, hinge)
+
+    i = bracket_minima(xs, gaps)
+    bends, fs, _ = refine_minima(lambda thetas: gap_slopes(steps, thetas, hinge),
+                                 xs[np.maximum(i - 1, 0)], xs[np.minimum(i + 1, coarse - 1)], xs[i], tol=tol)
+    minima = sorted(zip(bends.tolist(), fs.tolist()), key=lambda m: m[1])
+    return minima
+
+
+def scan_modulation(steps, bend_factor, amplitudes, frequencies, hinge='edge'):
+    """
+    Closure gap of every modulated profile bend * (1 + a * sin(2 pi f i / N)),
+    all chains advanced together in one batched pass.
+    Returns a (len(amplitudes), len(frequencies)) gap grid.
+    """
+    profiles = modulation_profiles(steps, bend_factor, amplitudes, frequencies)
+    gaps = batch_profile_gaps(profiles.reshape(-1, steps), hinge)
+    return gaps.reshape(profiles.shape[:2])
+
+
+if __name__ == "__main__":
+    import time
+
+    # Compare Brent on the bare gap against the derivative refinement, for Mass 122 and the proton
+    for steps, lo, hi in [(122, 21.0 / 122 * 0.5, 21.0 / 122 * 1.5), (1836, 0.001, 0.02)]:
+        calls = []
+        def counted_gap(theta):
+            calls.append(theta)
+            return chain_gap(steps, theta)
+
+        start = time.perf_counter()
+        minima = find_minima(counted_gap, lo, hi, coarse=16,
+                             batch_func=lambda thetas: batch_gaps(steps, thetas))
+        brent_time = time.perf_counter() - start
+
+        def counted_slope(thetas):
+            calls.append(len(thetas))
+            return gap_slopes(steps, thetas)
+
+        start = time.perf_counter()
+        xs = np.linspace(lo, hi, 16)
+        i = bracket_minima(xs, batch_gaps(steps, xs))
+        brent_builds, calls[:] = len(calls), []
+        bends, fs, rounds = refine_minima(counted_slope, xs[np.maximum(i - 1, 0)], xs[np.minimum(i + 1, 15)], xs[i])
+        slope_time = time.perf_counter() - start
+
+        print(f"--- RESONANCES FOR MASS {steps} ---")
+        best = int(np.argmin(fs))
+        print(f"  Brent:  Bend {minima[0][0]:.7f} | Gap {minima[0][1]:.6f} | "
+              f"{brent_builds} chain builds for {len(minima)} minima | {brent_time:.2f} s")
+        print(f"  Cubic:  Bend {bends[best]:.7f} | Gap {fs[best]:.6f} | "
+              f"{rounds} rounds, {sum(calls)} chain builds for {len(i)} minima | {slope_time:.2f} s")
+
+    # Figure-8 hunt: modulate the proton bend and look for the closest loop
+    amplitudes = np.linspace(0.0, 0.2, 41)
+    frequencies = np.arange(1, 9)
+    gaps = scan_modulation(1836, 0.0152, amplitudes, frequencies)
+    a, f = np.unravel_index(np.argmin(gaps), gaps.shape)
+    print(f"--- MODULATION SCAN (N=1836, {gaps.size} profiles) ---")
+    print(f"  Best: amplitude {amplitudes[a]:.3f}, {frequencies[f]} lobes | Gap: {gaps[a, f]:.4f}")
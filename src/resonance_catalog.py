@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from resonance import find_resonances
+from trixle_core import prefix_scan
+
+# results/ at the top of the repository, wherever the script is run from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'results', 'resonance_catalog.npy')
+
+# One row per chain length N
+CATALOG_DTYPE = np.dtype([
+    ('steps', '<i8'),
+    ('best_theta', '<f8'),
+    ('min_gap', '<f8'),
+    ('end_torsion', '<f8'),
+    ('second_theta', '<f8'),
+    ('second_gap', '<f8'),
+    ('done', 'u1')
+])
+
+
+def solve_steps(steps, scale=21.0, window=(0.5, 1.5)):
+    """
+    Best and second-best resonance of an N-step chain, searched in a window
+    around the Bend ~ 21/N scaling law. Returns one catalog row.
+    """
+    estimate = scale / steps
+    resonances = find_resonances(steps, estimate * window[0], estimate * window[1])
+    best_theta, min_gap = resonances[0]
+    second_theta, second_gap = resonances[1] if len(resonances) > 1 else (np.nan, np.nan)
+    _, torsions = prefix_scan([steps], best_theta)
+    return (steps, best_theta, min_gap, torsions[0], second_theta, second_gap, 1)
+
+
+class ResonanceCatalog:
+    """
+    Memory-mapped table of the best bend factor for every N in a range.
+
+    Row N - n_min holds the best theta, its gap, the end-face torsion and
+    the second-best minimum. Rows are filled by `build` and flagged done,
+    so an interrupted build resumes where it stopped. Asking for a wider
+    range extends the file and keeps every finished row.
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.table = None
+        if os.path.exists(path):
+            # Lookups only read; build and extend reopen it writable
+            self.table = np.load(path, mmap_mode='r')
+
+    @property
+    def n_min(self):
+        return int(self.table['steps'][0]) if self.table is not None else None
+
+    @property
+    def n_max(self):
+        return int(self.table['steps'][-1]) if self.table is not None else None
+
+    def extend(self, n_min, n_max):
+        """ Grows the table to cover [n_min, n_max], keeping finished rows. """
+        if self.table is not None:
+            if n_min >= self.n_min and n_max <= self.n_max:
+                if self.table.mode != 'r+':
+                    self.table = np.load(self.path, mmap_mode='r+')
+                return
+            n_min = min(n_min, self.n_min)
+            n_max = max(n_max, self.n_max)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp.npy'
+        table = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=CATALOG_DTYPE,
+                                          shape=(n_max - n_min + 1,))
+        table[:] = np.zeros(1, dtype=CATALOG_DTYPE)
+        table['steps'] = np.arange(n_min, n_max + 1)
+        if self.table is not None:
+            start = self.n_min - n_min
+            table[start:start + len(self.table)] = self.table
+        table.flush()
+        del table
+
+        self.table = None
+        os.replace(tmp_path, self.path)
+        self.table = np.load(self.path, mmap_mode='r+')
+
+    def build(self, n_min, n_max, workers=1, flush_every=32):
+        """ Fills every unfinished row in [n_min, n_max]. Safe to interrupt and rerun. """
+        self.extend(n_min, n_max)
+        rows = self._rows(n_min, n_max)
+        todo = rows['steps'][rows['done'] == 0].tolist()
+        print(f"--- CATALOG BUILD (N={n_min} - {n_max}) ---")
+        print(f"{len(rows) - len(todo)} rows already done, {len(todo)} to go")
+        if not todo:
+            return
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self._store(pool.map(solve_steps, todo, chunksize=8), flush_every)
+        else:
+            self._store(map(solve_steps, todo), flush_every)
+        self.table.flush()
+
+    def _store(self, solved, flush_every):
+        for count, row in enumerate(solved, 1):
+            self.table[row[0] - self.n_min] = row
+            if count % flush_every == 0:
+                self.table.flush()
+                print(f"  ...N={row[0]} | Bend: {row[1]:.5f} | Gap: {row[2]:.4f}")
+
+    def _rows(self, n_lo, n_hi):
+        """ The rows for N in [n_lo, n_hi]; empty when that misses the table. """
+        lo = max(n_lo, self.n_min) - self.n_min
+        hi = max(min(n_hi, self.n_max) - self.n_min + 1, lo)
+        return self.table[lo:hi]
+
+    def lookup(self, steps):
+        """ The finished row for N, or None. """
+        if self.table is None or not self.n_min <= steps <= self.n_max:
+            return None
+        row = self.table[steps - self.n_min]
+        return row if row['done'] else None
+
+    def best_factor(self, steps, default=None):
+        """ Best bend factor for N, falling back to `default` if not catalogued. """
+        row = self.lookup(steps)
+        return float(row['best_theta']) if row is not None else default
+
+    def query(self, n_lo=None, n_hi=None, max_gap=None):
+        """ Finished rows in [n_lo, n_hi], optionally only those closing below max_gap. """
+        if self.table is None:
+            return np.zeros(0, dtype=CATALOG_DTYPE)
+        rows = self._rows(self.n_min if n_lo is None else n_lo,
+                          self.n_max if n_hi is None else n_hi)
+        mask = rows['done'] == 1
+        if max_gap is not None:
+            mask &= rows['min_gap'] < max_gap
+        return np.asarray(rows[mask])
+
+
+if __name__ == "__main__":
+    catalog = ResonanceCatalog()
+    catalog.build(3, 2000, workers=os.cpu_count() or 1)
+
+    print("\n--- CLOSED LOOPS (Gap < 0.1) ---")
+    for row in catalog.query(max_gap=0.1):
+        print(f"N={row['steps']:<6} | Bend: {row['best_theta']:.5f} | Gap: {row['min_gap']:.4f} | "
+              f"Twist: {row['end_torsion']:.1f} deg")
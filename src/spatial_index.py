@@ -0,0 +1,247 @@
+import numpy as np
+
+from geometry_metrics import EDGE_PAIRS
+from trixle_core import tetra_centers, tetra_windows
+
+# Tetrahedra closer than this many steps share a vertex, so they always touch
+ADJACENT_STEPS = 4
+
+# Half of the 3x3 columns around a grid cell; dz = -1..1 is one contiguous key range.
+# With the upper half of the cell's own column they cover every neighbour pair once.
+FORWARD_COLUMNS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+class SpatialHash:
+    """
+    Uniform grid over a point cloud. Points are sorted by cell key, and each
+    occupied cell looks up its neighbours as contiguous key ranges with
+    searchsorted, so no per-point Python work is done.
+    Finds every pair closer than the cell size.
+    """
+    def __init__(self, points, cell_size):
+        self.points = np.asarray(points, dtype=float)
+        self.cell_size = float(cell_size)
+
+        # Cell coordinates per axis, with one empty cell of padding on every
+        # side so neighbour keys never wrap into another row
+        cx, cy, cz = (np.floor(axis / self.cell_size).astype(np.int64) for axis in self.points.T)
+        for axis in (cx, cy, cz):
+            axis -= axis.min() - 1
+        self.dims = np.array([cx.max() + 2, cy.max() + 2, cz.max() + 2])
+        keys = (cx * self.dims[1] + cy) * self.dims[2] + cz
+
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+        # The keys are sorted already, so occupied cells start wherever the key changes
+        self.cell_start = np.flatnonzero(np.r_[True, self.sorted_keys[1:] != self.sorted_keys[:-1]])
+        self.cell_keys = self.sorted_keys[self.cell_start]
+        self.cell_count = np.diff(np.append(self.cell_start, len(keys)))
+        # One contiguous float32 array per axis for the candidate screen:
+        # 1-D gathers are much cheaper than row gathers
+        self.sorted_xyz = np.ascontiguousarray(self.points[self.order].T, dtype=np.float32)
+
+    def _ranges(self):
+        """ (lo, hi) sorted-position ranges of every point's half-shell, one pair per column. """
+        point_cell = np.repeat(np.arange(len(self.cell_keys)), self.cell_count)
+        stride_x = self.dims[1] * self.dims[2]
+        # Sorted position where each occupied cell starts, plus the end
+        starts = np.append(self.cell_start, len(self.points))
+
+        # Own column: the points after this one in its cell, then the cell above
+        upper = starts[np.searchsorted(self.cell_keys, self.cell_keys + 1, side='right')]
+        yield np.arange(1, len(self.points) + 1), upper[point_cell]
+
+        for dx, dy in FORWARD_COLUMNS:
+            centre = self.cell_keys + dx * stride_x + dy * self.dims[2]
+            lo = starts[np.searchsorted(self.cell_keys, centre - 1, side='left')]
+            hi = starts[np.searchsorted(self.cell_keys, centre + 1, side='right')]
+            yield lo[point_cell], hi[point_cell]
+
+    def iter_pairs(self, radius=None, min_separation=1, chunk_size=1 << 20):
+        """
+        Yields (i, j, distance) blocks of every pair with j - i >= min_separation
+        and |p_i - p_j| < radius (radius defaults to, and may not exceed, the
+        cell size). No block expands more than chunk_size candidate pairs, so
+        memory stays bounded however dense the cloud is.
+        """
+        radius = self.cell_size if radius is None else radius
+        if radius > self.cell_size:
+            raise ValueError(f"radius {radius} exceeds the cell size {self.cell_size}")
+
+        # The float32 screen is padded; survivors are measured again in float64
+        screen = np.float32(radius * radius * (1.0 + 1e-5))
+        x, y, z = self.sorted_xyz
+        for lo, hi in self._ranges():
+            counts = hi - lo
+            # Split the query points so no block expands to more than chunk_size pairs
+            cum = np.cumsum(counts)
+            bounds = np.searchsorted(cum, np.arange(chunk_size, cum[-1], chunk_size))
+            for first, last in zip(np.r_[0, bounds], np.r_[bounds, len(counts)]):
+                n = counts[first:last]
+                offsets = np.cumsum(n)
+                total = int(offsets[-1]) if len(n) else 0
+                if total == 0:
+                    continue
+                a = np.repeat(np.arange(first, last), n)
+                b = np.repeat(lo[first:last] - (offsets - n), n) + np.arange(total)
+
+                d2 = np.square(x[a] - x[b])
+                d2 += np.square(y[a] - y[b])
+                d2 += np.square(z[a] - z[b])
+                near = np.flatnonzero(d2 < screen)
+                i, j = self.order[a[near]], self.order[b[near]]
+                far = np.abs(j - i) >= min_separation
+                i, j = i[far], j[far]
+                if len(i) == 0:
+                    continue
+
+                d = np.sqrt(np.square(self.points[i] - self.points[j]).sum(axis=1))
+                keep = d < radius
+                if keep.any():
+                    i, j = i[keep], j[keep]
+                    yield np.minimum(i, j), np.maximum(i, j), d[keep]
+
+    def pairs(self, radius=None, min_separation=1, chunk_size=1 << 20):
+        """ All of iter_pairs as three concatenated (i, j, distance) arrays. """
+        blocks = list(self.iter_pairs(radius, min_separation, chunk_size))
+        if not blocks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return tuple(np.concatenate(part) for part in zip(*blocks))
+
+
+def min_approach(vertices, min_separation=ADJACENT_STEPS):
+    """
+    Closest approach between tetrahedra at least `min_separation` steps
+    apart, measured between their centers. Returns (distance, i, j).
+    Pairs exactly min_separation apart already bound the answer, so a
+    single grid pass at that radius finds it.
+    """
+    centers = tetra_centers(vertices)
+    if len(centers) <= min_separation:
+        return np.inf, -1, -1
+
+    span = np.linalg.norm(centers[min_separation:] - centers[:-min_separation], axis=1)
+    k = int(np.argmin(span))
+    best = (float(span[k]), k, k + min_separation)
+    if best[0] == 0.0:
+        return best
+
+    for i, j, d in SpatialHash(centers, best[0]).iter_pairs(min_separation=min_separation):
+        k = int(np.argmin(d))
+        if d[k] < best[0]:
+            best = (float(d[k]), int(i[k]), int(j[k]))
+    return best
+
+
+def best_closure(vertices, min_steps=1):
+    """
+    The chain length N >= min_steps whose last tetrahedron comes closest to
+    the first, over every prefix of the chain. Returns (N, gap).
+    """
+    centers = tetra_centers(vertices)
+    gaps = np.linalg.norm(centers[min_steps:] - centers[0], axis=1)
+    if len(gaps) == 0:
+        return -1, np.inf
+    k = int(np.argmin(gaps))
+    return k + min_steps, float(gaps[k])
+
+
+def _face_normals(tets):
+    """ (P, 4, 3) normals of the four faces of every tetrahedron. """
+    faces = ([0, 0, 0, 1], [1, 1, 2, 2], [2, 3, 3, 3])
+    a, b, c = tets[:, faces[0]], tets[:, faces[1]], tets[:, faces[2]]
+    return np.cross(b - a, c - a)
+
+
+def _inner_radius(tets, centers):
+    """ Distance from each center to its nearest face plane: a ball that fits inside. """
+    normals = _face_normals(tets)
+    corner = tets[:, [0, 0, 0, 1]]
+    plane_dist = np.abs(np.einsum('pfk,pfk->pf', normals, corner - centers[:, None]))
+    return (plane_dist / np.linalg.norm(normals, axis=2)).min(axis=1)
+
+
+def _edges(tets):
+    return tets[:, EDGE_PAIRS[1]] - tets[:, EDGE_PAIRS[0]]
+
+
+def tetra_overlap(tets_a, tets_b, tol=1e-9):
+    """
+    Separating-axis test for P pairs of tetrahedra given as (P, 4, 3) arrays.
+    Two convex solids are disjoint exactly when one of the 8 face normals or
+    36 edge-edge cross products separates them. Touching counts as disjoint.
+    Returns a (P,) bool array.
+    """
+    edge_a, edge_b = _edges(tets_a), _edges(tets_b)
+    cross = np.cross(edge_a[:, :, None, :], edge_b[:, None, :, :]).reshape(len(tets_a), 36, 3)
+    axes = np.concatenate([_face_normals(tets_a), _face_normals(tets_b), cross], axis=1)
+
+    proj_a = np.einsum('pak,pvk->pav', axes, tets_a)
+    proj_b = np.einsum('pak,pvk->pav', axes, tets_b)
+    # Parallel edges give a zero axis; it never separates anything
+    slack = tol * np.linalg.norm(axes, axis=2)
+    separated = ((proj_a.max(axis=2) <= proj_b.min(axis=2) + slack) |
+                 (proj_b.max(axis=2) <= proj_a.min(axis=2) + slack))
+    separated &= np.linalg.norm(axes, axis=2) > 0
+    return ~separated.any(axis=1)
+
+
+def iter_overlaps(vertices, min_separation=ADJACENT_STEPS, chunk_size=65536):
+    """
+    Yields (i, j) blocks of every pair of tetrahedra at least
+    `min_separation` steps apart whose solids interpenetrate. Bounding
+    spheres about each center prune the candidates. Pairs within the sum of
+    the inner radii are accepted outright, and only the rest go through the
+    separating-axis test.
+    """
+    windows = tetra_windows(vertices)
+    centers = tetra_centers(vertices)
+    # Bounding sphere about each center: its furthest vertex, from contiguous slices
+    m = len(centers)
+    outer = np.sqrt(np.max([np.square(vertices[k:k + m] - centers).sum(axis=1) for k in range(4)], axis=0))
+
+    grid = SpatialHash(centers, 2 * outer.max())
+    for i, j, d in grid.iter_pairs(min_separation=min_separation, chunk_size=16 * chunk_size):
+        reach = d < outer[i] + outer[j]
+        i, j, d = i[reach], j[reach], d[reach]
+        if len(i) == 0:
+            continue
+
+        hit = d < _inner_radius(windows[i], centers[i]) + _inner_radius(windows[j], centers[j])
+        check = np.flatnonzero(~hit)
+        for lo in range(0, len(check), chunk_size):
+            block = check[lo:lo + chunk_size]
+            hit[block] = tetra_overlap(windows[i[block]], windows[j[block]])
+        if hit.any():
+            yield i[hit], j[hit]
+
+
+def tetra_overlaps(vertices, min_separation=ADJACENT_STEPS, chunk_size=65536):
+    """ All of iter_overlaps as two concatenated (i, j) arrays. """
+    blocks = list(iter_overlaps(vertices, min_separation, chunk_size))
+    if not blocks:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+def self_intersects(vertices, min_separation=ADJACENT_STEPS):
+    """ True if any two non-adjacent tetrahedra interpenetrate; stops at the first. """
+    return next(iter_overlaps(vertices, min_separation), None) is not None
+
+
+if __name__ == "__main__":
+    import time
+
+    from trixle_core import generate_chain
+
+    # A straight million-step helix, then the proton loop, which closes by
+    # passing through itself
+    for steps, bend in [(10**6, 0.0), (1836, 0.0152)]:
+        vertices = generate_chain(steps, bend)
+        start = time.perf_counter()
+        i, j = tetra_overlaps(vertices)
+        approach = min_approach(vertices)
+        closure = best_closure(vertices, min_steps=100)
+        elapsed = time.perf_counter() - start
+        print(f"N={steps:<8} bend={bend:<7} | self-intersections: {len(i):<5} | "
+              f"closest approach: {approach[0]:.3f} (tetra {approach[1]}-{approach[2]}) | "
+              f"best closure: N={closure[0]} gap {closure[1]:.3f} | {elapsed:.2f} s")
@@ -0,0 +1,879 @@
+import functools
+import itertools
+import math
+
+import numpy as np
+
+# The seed cell every chain grows from: a regular tetrahedron on the corners of a cube.
+SEED_TETRAHEDRON = np.array([
+    [1.0, 1.0, 1.0],
+    [1.0, -1.0, -1.0],
+    [-1.0, 1.0, -1.0],
+    [-1.0, -1.0, 1.0]
+])
+
+# Which axis the reflection vector is rotated about at every step.
+# 'edge'   = first edge of the exposed face (the working "Hinge" logic)
+# 'normal' = normal of the exposed face (the original, nearly inert bend)
+HINGE_RULES = ('edge', 'normal')
+
+# Bump whenever the stacking arithmetic changes, so cached gaps from an
+# older kernel are never reused.
+KERNEL_VERSION = 1
+
+
+def hinge_mask(hinge, steps):
+    """
+    Per-step hinge choice as a (steps,) bool array, True where the step
+    hinges on the edge. `hinge` is one rule for the whole chain or one
+    rule per step.
+    """
+    if isinstance(hinge, str):
+        if hinge not in HINGE_RULES:
+            raise ValueError(f"Unknown hinge rule {hinge!r}, expected one of {HINGE_RULES}")
+        return np.full(steps, hinge == 'edge')
+
+    rules = np.asarray(hinge)
+    if rules.shape != (steps,):
+        raise ValueError(f"Need one hinge rule per step ({steps}), got shape {rules.shape}")
+    unknown = set(rules.tolist()) - set(HINGE_RULES)
+    if unknown:
+        raise ValueError(f"Unknown hinge rules {sorted(unknown)}, expected {HINGE_RULES}")
+    return rules == 'edge'
+
+
+def generate_chain(steps, bend_factor, hinge='edge', out=None):
+    """
+    Stacks `steps` tetrahedra onto the seed and returns every vertex as an
+    (steps + 4, 3) float64 array.
+
+    `bend_factor` is the hinge angle in radians and `hinge` the rule from
+    HINGE_RULES, each either one value for the whole chain or one per step.
+    The Rodrigues rotation is written out by hand on Python floats so a step
+    costs a few microseconds instead of a dozen NumPy calls. Pass `out` to
+    write into a preallocated array.
+    """
+    edge_steps = hinge_mask(hinge, steps)
+
+    if out is None:
+        out = np.empty((steps + 4, 3))
+    elif out.shape != (steps + 4, 3):
+        raise ValueError(f"out must have shape {(steps + 4, 3)}, got {out.shape}")
+    out[:4] = SEED_TETRAHEDRON
+
+    thetas = np.broadcast_to(np.asarray(bend_factor, dtype=float), (steps,))
+    if np.all(thetas == thetas[:1]):
+        # Constant bend: one trig evaluation for the whole chain
+        theta = float(thetas[0]) if steps else 0.0
+        cos_t = [math.cos(theta)] * steps
+        sin_t = [math.sin(theta)] * steps
+    else:
+        cos_t = np.cos(thetas).tolist()
+        sin_t = np.sin(thetas).tolist()
+    if np.all(edge_steps == edge_steps[:1]):
+        use_edge = bool(edge_steps[0]) if steps else True
+    else:
+        use_edge = edge_steps.tolist()
+
+    new_vertices = []
+    advance_chain(SEED_TETRAHEDRON.tolist(), cos_t, sin_t, use_edge, new_vertices.append)
+
+    if steps:
+        out[4:] = new_vertices
+    return out
+
+
+def advance_chain(state, cos_t, sin_t, use_edge, push):
+    """
+    The stacking loop behind the chain builders. Walks one step per entry
+    of `cos_t`/`sin_t` from the rolling 4-vertex `state` (the last
+    tetrahedron, oldest vertex first), hands each new vertex to `push` as
+    an (x, y, z) tuple and returns the final state. `use_edge` is one bool
+    for every step or a sequence with one per step.
+    """
+    # Rolling state: a = the vertex being reflected, (b, c, d) = the exposed face
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz), (dx, dy, dz) = state
+    edge_flags = itertools.repeat(use_edge) if isinstance(use_edge, bool) else use_edge
+
+    for c, s, edge in zip(cos_t, sin_t, edge_flags):
+        fx = (bx + cx + dx) / 3.0
+        fy = (by + cy + dy) / 3.0
+        fz = (bz + cz + dz) / 3.0
+
+        # Vector from the face center to the old vertex (this is what we reflect)
+        ux = ax - fx
+        uy = ay - fy
+        uz = az - fz
+
+        # Hinge axis
+        e1x = cx - bx
+        e1y = cy - by
+        e1z = cz - bz
+        if edge:
+            kx, ky, kz = e1x, e1y, e1z
+        else:
+            e2x = dx - bx
+            e2y = dy - by
+            e2z = dz - bz
+            kx = e1y * e2z - e1z * e2y
+            ky = e1z * e2x - e1x * e2z
+            kz = e1x * e2y - e1y * e2x
+        norm = math.sqrt(kx * kx + ky * ky + kz * kz)
+        kx /= norm
+        ky /= norm
+        kz /= norm
+
+        # Rodrigues rotation of u about k
+        omc = 1 - c
+        kdu = kx * ux + ky * uy + kz * uz
+        rx = ux * c + (ky * uz - kz * uy) * s + kx * kdu * omc
+        ry = uy * c + (kz * ux - kx * uz) * s + ky * kdu * omc
+        rz = uz * c + (kx * uy - ky * ux) * s + kz * kdu * omc
+
+        # New vertex: face center minus the rotated vector
+        nx = fx - rx
+        ny = fy - ry
+        nz = fz - rz
+        push((nx, ny, nz))
+
+        ax, ay, az = bx, by, bz
+        bx, by, bz = cx, cy, cz
+        cx, cy, cz = dx, dy, dz
+        dx, dy, dz = nx, ny, nz
+
+    return (ax, ay, az), (bx, by, bz), (cx, cy, cz), (dx, dy, dz)
+
+
+def generate_chain_tangent(steps, bend_factor, hinge='edge'):
+    """
+    generate_chain, also carrying the derivative of every vertex with
+    respect to the bend. Returns (vertices, tangents), both (steps + 4, 3).
+
+    Every coordinate is a dual number (value, d/dtheta) pushed through the
+    same Rodrigues step, so one pass gives the exact derivative at about
+    three times the cost of the plain build. With a per-step `bend_factor`
+    the derivative is for shifting every step's bend by the same amount.
+    """
+    edge_steps = hinge_mask(hinge, steps)
+    thetas = np.broadcast_to(np.asarray(bend_factor, dtype=float), (steps,))
+    cos_t = np.cos(thetas).tolist()
+    sin_t = np.sin(thetas).tolist()
+
+    vertices = np.empty((steps + 4, 3))
+    tangents = np.zeros((steps + 4, 3))
+    vertices[:4] = SEED_TETRAHEDRON
+    new_vertices = []
+    new_tangents = []
+
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz), (dx, dy, dz) = SEED_TETRAHEDRON.tolist()
+    # The seed does not move with the bend
+    tax = tay = taz = tbx = tby = tbz = tcx = tcy = tcz = tdx = tdy = tdz = 0.0
+
+    for c, s, edge in zip(cos_t, sin_t, edge_steps.tolist()):
+        fx = (bx + cx + dx) / 3.0
+        fy = (by + cy + dy) / 3.0
+        fz = (bz + cz + dz) / 3.0
+        tfx = (tbx + tcx + tdx) / 3.0
+        tfy = (tby + tcy + tdy) / 3.0
+        tfz = (tbz + tcz + tdz) / 3.0
+
+        ux = ax - fx
+        uy = ay - fy
+        uz = az - fz
+        tux = tax - tfx
+        tuy = tay - tfy
+        tuz = taz - tfz
+
+        # Hinge axis and its derivative
+        e1x = cx - bx
+        e1y = cy - by
+        e1z = cz - bz
+        te1x = tcx - tbx
+        te1y = tcy - tby
+        te1z = tcz - tbz
+        if edge:
+            kx, ky, kz = e1x, e1y, e1z
+            tkx, tky, tkz = te1x, te1y, te1z
+        else:
+            e2x = dx - bx
+            e2y = dy - by
+            e2z = dz - bz
+            te2x = tdx - tbx
+            te2y = tdy - tby
+            te2z = tdz - tbz
+            kx = e1y * e2z - e1z * e2y
+            ky = e1z * e2x - e1x * e2z
+            kz = e1x * e2y - e1y * e2x
+            tkx = te1y * e2z + e1y * te2z - te1z * e2y - e1z * te2y
+            tky = te1z * e2x + e1z * te2x - te1x * e2z - e1x * te2z
+            tkz = te1x * e2y + e1x * te2y - te1y * e2x - e1y * te2x
+        norm = math.sqrt(kx * kx + ky * ky + kz * kz)
+        kx /= norm
+        ky /= norm
+        kz /= norm
+        # d(k / |k|): drop the part along k, then scale
+        along = kx * tkx + ky * tky + kz * tkz
+        tkx = (tkx - kx * along) / norm
+        tky = (tky - ky * along) / norm
+        tkz = (tkz - kz * along) / norm
+
+        # Rodrigues rotation; d(cos)/dtheta = -sin and d(sin)/dtheta = cos
+        omc = 1 - c
+        kdu = kx * ux + ky * uy + kz * uz
+        tkdu = tkx * ux + tky * uy + tkz * uz + kx * tux + ky * tuy + kz * tuz
+        kux = ky * uz - kz * uy
+        kuy = kz * ux - kx * uz
+        kuz = kx * uy - ky * ux
+        tkux = tky * uz + ky * tuz - tkz * uy - kz * tuy
+        tkuy = tkz * ux + kz * tux - tkx * uz - kx * tuz
+        tkuz = tkx * uy + kx * tuy - tky * ux - ky * tux
+
+        rx = ux * c + kux * s + kx * kdu * omc
+        ry = uy * c + kuy * s + ky * kdu * omc
+        rz = uz * c + kuz * s + kz * kdu * omc
+        trx = tux * c - ux * s + tkux * s + kux * c + (tkx * kdu + kx * tkdu) * omc + kx * kdu * s
+        try_ = tuy * c - uy * s + tkuy * s + kuy * c + (tky * kdu + ky * tkdu) * omc + ky * kdu * s
+        trz = tuz * c - uz * s + tkuz * s + kuz * c + (tkz * kdu + kz * tkdu) * omc + kz * kdu * s
+
+        nx = fx - rx
+        ny = fy - ry
+        nz = fz - rz
+        tnx = tfx - trx
+        tny = tfy - try_
+        tnz = tfz - trz
+        new_vertices.append((nx, ny, nz))
+        new_tangents.append((tnx, tny, tnz))
+
+        ax, ay, az = bx, by, bz
+        bx, by, bz = cx, cy, cz
+        cx, cy, cz = dx, dy, dz
+        dx, dy, dz = nx, ny, nz
+        tax, tay, taz = tbx, tby, tbz
+        tbx, tby, tbz = tcx, tcy, tcz
+        tcx, tcy, tcz = tdx, tdy, tdz
+        tdx, tdy, tdz = tnx, tny, tnz
+
+    if steps:
+        vertices[4:] = new_vertices
+        tangents[4:] = new_tangents
+    return vertices, tangents
+
+
+def closure_gap(vertices):
+    """ Distance between the centers of the first and last tetrahedron. """
+    start_pt = vertices[:4].mean(axis=0)
+    end_pt = vertices[-4:].mean(axis=0)
+    return float(np.linalg.norm(end_pt - start_pt))
+
+
+def chain_gap(steps, bend_factor, hinge='edge'):
+    """ Builds a chain and returns only its closure gap. """
+    return closure_gap(generate_chain(steps, bend_factor, hinge))
+
+
+def chain_gap_slope(steps, bend_factor, hinge='edge'):
+    """ Closure gap of one chain and its derivative with respect to the bend, as (gap, slope). """
+    vertices, tangents = generate_chain_tangent(steps, bend_factor, hinge)
+    offset = vertices[-4:].mean(axis=0) - vertices[:4].mean(axis=0)
+    gap = float(np.linalg.norm(offset))
+    return gap, float(offset @ tangents[-4:].mean(axis=0) / gap)
+
+
+def batch_gaps(steps, bend_factors, hinge='edge', chunk_size=8192):
+    """
+    Closure gaps for a whole vector of bend factors at once.
+
+    All B chains advance together one step at a time. Each chain only keeps
+    its last tetrahedron, held in a (B, 4, 3) ring buffer where the slot
+    being reflected is overwritten by the new vertex. Large batches are
+    processed in chunks of `chunk_size` chains to stay in cache.
+    Returns the (B,) gap vector.
+    """
+    edge_steps = hinge_mask(hinge, steps)
+    thetas = np.asarray(bend_factors, dtype=float)
+    flat = thetas.ravel()
+    gaps = np.empty(flat.shape)
+    for lo in range(0, len(flat), chunk_size):
+        gaps[lo:lo + chunk_size] = _batch_gap_chunk(steps, flat[lo:lo + chunk_size], edge_steps)
+    return gaps.reshape(thetas.shape)
+
+
+def batch_profile_gaps(profiles, hinge='edge', chunk_size=8192):
+    """
+    Closure gaps for a batch of per-step bend profiles, one chain per row of
+    the (B, steps) `profiles` array, advanced together like batch_gaps.
+    `hinge` is one rule or one rule per step, shared by every chain.
+    Returns the (B,) gap vector.
+    """
+    profiles = np.atleast_2d(np.asarray(profiles, dtype=float))
+    steps = profiles.shape[1]
+    edge_steps = hinge_mask(hinge, steps)
+    gaps = np.empty(len(profiles))
+    for lo in range(0, len(profiles), chunk_size):
+        gaps[lo:lo + chunk_size] = _batch_gap_chunk(steps, profiles[lo:lo + chunk_size], edge_steps)
+    return gaps
+
+
+def batch_gap_slopes(steps, bend_factors, hinge='edge', chunk_size=8192):
+    """
+    batch_gaps that also returns d(gap)/d(bend) for every chain. Each
+    chain's (B, 4, 3) ring buffer has a twin holding the derivative of
+    every vertex, advanced through the same Rodrigues step.
+    Returns (gaps, slopes), both shaped like `bend_factors`.
+    """
+    edge_steps = hinge_mask(hinge, steps)
+    thetas = np.asarray(bend_factors, dtype=float)
+    flat = thetas.ravel()
+    gaps = np.empty(flat.shape)
+    slopes = np.empty(flat.shape)
+    for lo in range(0, len(flat), chunk_size):
+        gaps[lo:lo + chunk_size], slopes[lo:lo + chunk_size] = _batch_slope_chunk(
+            steps, flat[lo:lo + chunk_size], edge_steps)
+    return gaps.reshape(thetas.shape), slopes.reshape(thetas.shape)
+
+
+def modulation_profiles(steps, bend_factor, amplitudes, frequencies):
+    """
+    Sinusoidally modulated bend profiles, bend * (1 + a * sin(2 pi f i / steps)),
+    for every pair of amplitude a and frequency f (lobes per chain).
+    Returns an (len(amplitudes), len(frequencies), steps) array.
+    """
+    a = np.asarray(amplitudes, dtype=float)[:, None, None]
+    f = np.asarray(frequencies, dtype=float)[None, :, None]
+    phase = 2 * np.pi * np.arange(steps) / steps
+    return bend_factor * (1.0 + a * np.sin(f * phase))
+
+
+def batch_prefix_gaps(step_counts, bend_factors, hinge='edge', chunk_size=8192, out=None):
+    """
+    Closure gaps for every step count x bend factor pair in one walk.
+
+    Every chain in the batch is advanced to the largest N. The gap is read
+    from the ring buffer whenever the walk passes a requested N, so shorter
+    chains cost nothing extra. `hinge` is one rule or one per step of the
+    longest chain. Returns (or fills `out` with) a (len(step_counts), B)
+    array.
+    """
+    ns = np.asarray(step_counts, dtype=int)
+    thetas = np.asarray(bend_factors, dtype=float).ravel()
+    steps = int(ns.max()) if len(ns) else 0
+    edge_steps = hinge_mask(hinge, steps)
+    if out is None:
+        out = np.empty((len(ns), len(thetas)))
+    for lo in range(0, len(thetas), chunk_size):
+        _batch_gap_chunk(steps, thetas[lo:lo + chunk_size], edge_steps,
+                         record=(ns, out[:, lo:lo + chunk_size]))
+    return out
+
+
+def _batch_gap_chunk(steps, thetas, edge_steps, record=None):
+    # `thetas` is (B,) for constant bends or (B, steps) for per-step profiles.
+    # `record` = (step_counts, out) also writes the gap after each of those steps into out's rows
+    start_pt = SEED_TETRAHEDRON.mean(axis=0)[:, None]
+    rows = {}
+    if record is not None:
+        for row, n in enumerate(record[0].tolist()):
+            rows.setdefault(n, []).append(row)
+        for row in rows.pop(0, []):
+            record[1][row] = 0.0
+
+    # Ring buffer as (slot, axis, chain): every component of every vertex is
+    # one contiguous B-vector, so each update below is a single fast ufunc
+    B = len(thetas)
+    state = np.empty((4, 3, B))
+    state[:] = SEED_TETRAHEDRON[:, :, None]
+    total = state.sum(axis=0)
+
+    per_step = thetas.ndim == 2
+    cos_t = np.cos(thetas)
+    sin_t = np.sin(thetas)
+    if per_step:
+        cos_t = np.ascontiguousarray(cos_t.T)
+        sin_t = np.ascontiguousarray(sin_t.T)
+    else:
+        cos_i, sin_i = cos_t, sin_t
+        omc = 1 - cos_i
+    face_center = np.empty((3, B))
+    direction = np.empty((3, B))
+    k = np.empty((3, B))
+    e1 = np.empty((3, B))
+    e2 = np.empty((3, B))
+    cross = np.empty((3, B))
+    k_dot = np.empty(B)
+    tmp = np.empty(B)
+
+    # Three-term sums are taken as (x + z) + y, the order the KERNEL_VERSION 1
+    # gaps in the shared cache were computed in. Any other order moves the
+    # last bits, so a change here needs a new KERNEL_VERSION
+    for i in range(steps):
+        a = state[i % 4]
+        b = state[(i + 1) % 4]
+        c = state[(i + 2) % 4]
+        d = state[(i + 3) % 4]
+
+        np.add(b, c, out=face_center)
+        face_center += d
+        face_center /= 3.0
+        np.subtract(a, face_center, out=direction)
+
+        # Hinge axis
+        if edge_steps[i]:
+            np.subtract(c, b, out=k)
+        else:
+            np.subtract(c, b, out=e1)
+            np.subtract(d, b, out=e2)
+            np.multiply(e1[1], e2[2], out=k[0])
+            k[0] -= e1[2] * e2[1]
+            np.multiply(e1[2], e2[0], out=k[1])
+            k[1] -= e1[0] * e2[2]
+            np.multiply(e1[0], e2[1], out=k[2])
+            k[2] -= e1[1] * e2[0]
+        np.multiply(k[0], k[0], out=tmp)
+        tmp += k[2] * k[2]
+        tmp += k[1] * k[1]
+        k /= np.sqrt(tmp, out=tmp)
+
+        # Rodrigues rotation, written out per component
+        np.multiply(k[0], direction[0], out=k_dot)
+        np.multiply(k[2], direction[2], out=tmp)
+        k_dot += tmp
+        np.multiply(k[1], direction[1], out=tmp)
+        k_dot += tmp
+        np.multiply(k[1], direction[2], out=cross[0])
+        cross[0] -= np.multiply(k[2], direction[1], out=tmp)
+        np.multiply(k[2], direction[0], out=cross[1])
+        cross[1] -= np.multiply(k[0], direction[2], out=tmp)
+        np.multiply(k[0], direction[1], out=cross[2])
+        cross[2] -= np.multiply(k[1], direction[0], out=tmp)
+        if per_step:
+            cos_i, sin_i = cos_t[i], sin_t[i]
+            omc = 1 - cos_i
+        # v_rot = direction * cos + cross * sin + k * k_dot * (1 - cos), built in `direction`
+        direction *= cos_i
+        cross *= sin_i
+        direction += cross
+        k *= k_dot
+        k *= omc
+        direction += k
+
+        # The new vertex replaces the one it was reflected from
+        if record is None:
+            np.subtract(face_center, direction, out=a)
+            continue
+
+        # Keep the vertex sum of the current tetrahedron up to date instead of re-reducing the buffer
+        total -= a
+        np.subtract(face_center, direction, out=a)
+        total += a
+        if i + 1 in rows:
+            offset = total / 4.0 - start_pt
+            gap = np.sqrt(offset[0] * offset[0] + offset[2] * offset[2] + offset[1] * offset[1])
+            for row in rows[i + 1]:
+                record[1][row] = gap
+
+    # Sum the last tetrahedron in stacking order
+    order = [(steps + j) % 4 for j in range(4)]
+    end_pt = (state[order[0]] + state[order[1]] + state[order[2]] + state[order[3]]) / 4.0
+    offset = end_pt - start_pt
+    return np.sqrt(offset[0] * offset[0] + offset[2] * offset[2] + offset[1] * offset[1])
+
+
+def _row_cross(p, q, out):
+    """ Row-wise cross product of two (B, 3) arrays, written into `out`. """
+    out[:, 0] = p[:, 1] * q[:, 2] - p[:, 2] * q[:, 1]
+    out[:, 1] = p[:, 2] * q[:, 0] - p[:, 0] * q[:, 2]
+    out[:, 2] = p[:, 0] * q[:, 1] - p[:, 1] * q[:, 0]
+    return out
+
+
+def _batch_slope_chunk(steps, thetas, edge_steps):
+    # Same walk as _batch_gap_chunk, with `tangent` holding d(state)/d(theta)
+    state = np.empty((len(thetas), 4, 3))
+    state[:] = SEED_TETRAHEDRON
+    tangent = np.zeros_like(state)
+
+    cos_i = np.cos(thetas)[:, None]
+    sin_i = np.sin(thetas)[:, None]
+    omc = 1 - cos_i
+    k = np.empty((len(thetas), 3))
+    dk = np.empty_like(k)
+    cross = np.empty_like(k)
+    d_cross = np.empty_like(k)
+    scratch = np.empty_like(k)
+
+    for i in range(steps):
+        slot = i % 4
+        a, da = state[:, slot], tangent[:, slot]
+        b, db = state[:, (i + 1) % 4], tangent[:, (i + 1) % 4]
+        c, dc = state[:, (i + 2) % 4], tangent[:, (i + 2) % 4]
+        d, dd = state[:, (i + 3) % 4], tangent[:, (i + 3) % 4]
+
+        face_center = (b + c + d) / 3.0
+        d_face_center = (db + dc + dd) / 3.0
+        direction = a - face_center
+        d_direction = da - d_face_center
+
+        # Hinge axis, normalised, with the derivative of the unit vector
+        if edge_steps[i]:
+            k[:] = c - b
+            dk[:] = dc - db
+        else:
+            e1, e2 = c - b, d - b
+            _row_cross(e1, e2, k)
+            _row_cross(dc - db, e2, dk)
+            dk += _row_cross(e1, dd - db, scratch)
+        norm = np.sqrt(np.einsum('ij,ij->i', k, k))[:, None]
+        k /= norm
+        dk -= k * np.einsum('ij,ij->i', k, dk)[:, None]
+        dk /= norm
+
+        # Rodrigues rotation and its derivative
+        _row_cross(k, direction, cross)
+        _row_cross(dk, direction, d_cross)
+        d_cross += _row_cross(k, d_direction, scratch)
+        k_dot = np.einsum('ij,ij->i', k, direction)[:, None]
+        d_k_dot = (np.einsum('ij,ij->i', dk, direction) + np.einsum('ij,ij->i', k, d_direction))[:, None]
+        v_rot = direction * cos_i + cross * sin_i + k * k_dot * omc
+        d_v_rot = (d_direction * cos_i - direction * sin_i + d_cross * sin_i + cross * cos_i +
+                   (dk * k_dot + k * d_k_dot) * omc + k * k_dot * sin_i)
+
+        state[:, slot] = face_center - v_rot
+        tangent[:, slot] = d_face_center - d_v_rot
+
+    # The slot order does not matter for a plain sum
+    end_pt = state.mean(axis=1)
+    d_end_pt = tangent.mean(axis=1)
+    offset = end_pt - SEED_TETRAHEDRON.mean(axis=0)
+    gaps = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+    return gaps, np.einsum('ij,ij->i', offset, d_end_pt) / gaps
+
+
+def prefix_scan(step_counts, bend_factor, hinge='edge'):
+    """
+    Closure gap and end torsion for many chain lengths at one bend factor.
+
+    Every shorter chain is a prefix of the longest one, so that chain is
+    built once and each requested N is read from the shared vertex array.
+    Torsion is the angle (degrees) between the first face normal and the
+    normal of the last exposed face. Returns (gaps, torsions) arrays in the
+    order of `step_counts`.
+    """
+    ns = np.asarray(step_counts, dtype=int)
+    vertices = generate_chain(int(ns.max()), bend_factor, hinge)
+
+    centers = tetra_centers(vertices)
+    gaps = np.linalg.norm(centers[ns] - centers[0], axis=1)
+
+    normals = face_normals(vertices)
+    dots = np.clip(normals[ns + 1] @ normals[0], -1.0, 1.0)
+    torsions = np.degrees(np.arccos(dots))
+    return gaps, torsions
+
+
+def face_normals(vertices):
+    """ Unit normal of every face (i, i+1, i+2) along the chain. """
+    normals = np.cross(vertices[1:-1] - vertices[:-2], vertices[2:] - vertices[:-2])
+    return normals / np.linalg.norm(normals, axis=1)[:, None]
+
+
+def find_period(bend_factor, hinge='edge', max_period=64, tol=1e-9):
+    """
+    Looks for a period p such that tetrahedron p is a rigid copy of the seed
+    (same ordered edge lengths, same handedness). The stacking rule commutes
+    with rigid motions, so the whole chain then repeats: tetrahedron j + p is
+    the same 4x4 transform M applied to tetrahedron j.
+
+    Returns (p, M), or None if the chain does not repeat within `max_period`
+    steps. A constant-bend 'normal' hinge (and any chain with zero bend) is
+    the pure Boerdijk-Coxeter screw with p = 1. The 'edge' hinge with a real
+    bend distorts every tetrahedron, so it has no period. Results for a
+    single hinge rule are cached per (bend, hinge, max_period, tol).
+    """
+    if isinstance(hinge, str):
+        return _cached_period(float(bend_factor), hinge, max_period, tol)
+    return _probe_period(bend_factor, hinge, max_period, tol)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_period(bend_factor, hinge, max_period, tol):
+    found = _probe_period(bend_factor, hinge, max_period, tol)
+    if found is not None:
+        # Shared between callers
+        found[1].setflags(write=False)
+    return found
+
+
+def _probe_period(bend_factor, hinge, max_period, tol):
+    """ Walks the probe chain of find_period and tests every candidate period. """
+    vertices = generate_chain(_probe_steps(max_period), bend_factor, hinge)
+    windows = tetra_windows(vertices)
+    pairs = ([0, 0, 0, 1, 1, 2], [1, 2, 3, 2, 3, 3])
+    lengths = np.linalg.norm(windows[:, pairs[0]] - windows[:, pairs[1]], axis=-1)
+    scale = lengths[0].max()
+
+    candidates = np.flatnonzero(np.abs(lengths[1:max_period + 1] - lengths[0]).max(axis=1) < tol * scale) + 1
+    for p in candidates:
+        M = _rigid_transform(windows[0], windows[p])
+        if M is None:
+            continue
+        # Check the transform against the walked chain before trusting it
+        predicted = windows[:-p] @ M[:3, :3].T + M[:3, 3]
+        if np.abs(predicted - windows[p:]).max() < tol * scale * len(windows):
+            return int(p), M
+    return None
+
+
+def _probe_steps(max_period):
+    """ Length of the chain find_period walks to look for a period. """
+    return max_period + 8 * max_period
+
+
+def _rigid_transform(source, target):
+    """ Proper rigid 4x4 transform taking the source points onto the target (Kabsch). """
+    src_c = source.mean(axis=0)
+    dst_c = target.mean(axis=0)
+    u, _, vt = np.linalg.svd((source - src_c).T @ (target - dst_c))
+    if np.linalg.det(vt.T @ u.T) < 0:
+        # The copy is mirrored: no proper motion maps one onto the other
+        return None
+    M = np.eye(4)
+    M[:3, :3] = vt.T @ u.T
+    M[:3, 3] = dst_c - M[:3, :3] @ src_c
+    return M
+
+
+def matrix_power(M, n):
+    """ M**n for a 4x4 transform by repeated squaring (O(log n) products). """
+    result = np.eye(4)
+    base = M.copy()
+    while n:
+        if n & 1:
+            result = result @ base
+        base = base @ base
+        n >>= 1
+    return result
+
+
+def closure_gap_power(steps, bend_factor, hinge='edge', max_period=64):
+    """
+    Closure gap of an N-step chain in O(log N) when the chain is periodic.
+
+    With N = q * p + r the last tetrahedron is M**q applied to tetrahedron r,
+    so only the first p steps are ever walked. Chains without a period, and
+    chains no longer than the probe find_period walks, go step by step.
+    """
+    if steps <= _probe_steps(max_period):
+        return chain_gap(steps, bend_factor, hinge)
+
+    found = find_period(bend_factor, hinge, max_period)
+    if found is None:
+        return chain_gap(steps, bend_factor, hinge)
+
+    p, M = found
+    q, r = divmod(steps, p)
+    head = generate_chain(r, bend_factor, hinge)
+    end_pt = matrix_power(M, q) @ np.append(head[-4:].mean(axis=0), 1.0)
+    return float(np.linalg.norm(end_pt[:3] - head[:4].mean(axis=0)))
+
+
+def periodic_chain(steps, bend_factor, hinge='edge', max_period=64):
+    """
+    Vertices of a periodic chain without stepping through it.
+
+    The per-period transform is split into a screw (rotation angle about an
+    axis plus a slide along it), so vertex q * p + r is placed directly by
+    rotating vertex r through q times the angle. Rounding error no longer
+    builds up along the chain. Returns None if the chain has no period.
+    """
+    found = find_period(bend_factor, hinge, max_period)
+    if found is None:
+        return None
+
+    p, M = found
+    head = generate_chain(p, bend_factor, hinge)[:p]
+    R, t = M[:3, :3], M[:3, 3]
+
+    angle = math.acos(np.clip((np.trace(R) - 1) / 2, -1.0, 1.0))
+    if angle < 1e-12:
+        # Pure translation
+        q = np.arange(steps + 4) // p
+        return head[np.arange(steps + 4) % p] + q[:, None] * t
+
+    axis = np.array([R[2, 1] - R[1, 2], R[0, 2] - R[2, 0], R[1, 0] - R[0, 1]])
+    axis /= np.linalg.norm(axis)
+    slide = t @ axis
+    # A point on the screw axis: (I - R) p0 = t - slide * axis
+    p0 = np.linalg.lstsq(np.eye(3) - R, t - slide * axis, rcond=None)[0]
+
+    j = np.arange(steps + 4)
+    q, r = j // p, j % p
+    rel = head[r] - p0
+    phi = (q * angle)[:, None]
+    cos_p, sin_p = np.cos(phi), np.sin(phi)
+    rotated = (rel * cos_p + np.cross(axis, rel) * sin_p +
+               axis * (rel @ axis)[:, None] * (1 - cos_p))
+    return p0 + rotated + (q * slide)[:, None] * axis
+
+
+def face_centers(vertices):
+    """
+    Center of the exposed face before every step: row i is the mean of
+    vertices i+1, i+2, i+3. This is the centerline the tube viewers trace.
+    """
+    return (vertices[1:-2] + vertices[2:-1] + vertices[3:]) / 3.0
+
+
+def tetra_windows(vertices):
+    """ (steps + 1, 4, 3) zero-copy view of every tetrahedron's vertices. """
+    return np.lib.stride_tricks.sliding_window_view(vertices, (4, 3))[:, 0]
+
+
+def tetra_centers(vertices):
+    """ Center of every tetrahedron, summed in stacking order. """
+    return (vertices[:-3] + vertices[1:-2] + vertices[2:-1] + vertices[3:]) / 4.0
+
+
+class TrixleChain:
+    """
+    A chain as one contiguous (steps + 4, 3) vertex array.
+
+    Connectivity is implicit (tetrahedron i is vertices i..i+3), so cells,
+    edges, per-tetrahedron windows, face centers and face normals are
+    derived on first use. Cells and windows are zero-copy strided views.
+    """
+    __slots__ = ('vertices', 'bend_factor', 'hinge',
+                 '_cells', '_edges', '_faces', '_face_centers', '_face_normals')
+
+    def __init__(self, vertices, bend_factor=None, hinge='edge'):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+        self.bend_factor = bend_factor
+        self.hinge = hinge
+        self._cells = None
+        self._edges = None
+        self._faces = None
+        self._face_centers = None
+        self._face_normals = None
+
+    @classmethod
+    def build(cls, steps, bend_factor, hinge='edge'):
+        return cls(generate_chain(steps, bend_factor, hinge), bend_factor, hinge)
+
+    @property
+    def steps(self):
+        return len(self.vertices) - 4
+
+    @property
+    def cells(self):
+        """ (steps + 1, 4) vertex indices of every tetrahedron (read-only view). """
+        if self._cells is None:
+            self._cells = np.lib.stride_tricks.sliding_window_view(np.arange(len(self.vertices)), 4)
+        return self._cells
+
+    @property
+    def windows(self):
+        """ (steps + 1, 4, 3) vertices of every tetrahedron (read-only view). """
+        return tetra_windows(self.vertices)
+
+    @property
+    def edges(self):
+        """ (E, 2) unique edges: every vertex joins the next three. """
+        if self._edges is None:
+            n = len(self.vertices)
+            self._edges = np.concatenate([
+                np.column_stack([np.arange(n - k), np.arange(k, n)]) for k in (1, 2, 3)
+            ])
+        return self._edges
+
+    @property
+    def faces(self):
+        """
+        (F, 3) triangles of the outer surface. Tetrahedron j shares
+        (j, j+1, j+2) and (j+1, j+2, j+3) with its neighbours, so only
+        (j, j+1, j+3) and (j, j+2, j+3) are exposed, plus the two end caps.
+        Triangles are wound outward using the handedness of each tetrahedron.
+        """
+        if self._faces is None:
+            n = len(self.vertices)
+            w = self.windows
+            e1, e2, e3 = w[:, 1] - w[:, 0], w[:, 2] - w[:, 0], w[:, 3] - w[:, 0]
+            right = np.einsum('ij,ij->i', e1, np.cross(e2, e3)) > 0
+
+            # For a right-handed (0, 1, 2, 3) the outward faces are (0, 1, 3), (0, 3, 2),
+            # (0, 2, 1) and (1, 2, 3); mirrored tetrahedra swap the last two indices
+            j = np.arange(n - 3)
+            side_a = np.column_stack([j, np.where(right, j + 1, j + 3), np.where(right, j + 3, j + 1)])
+            side_b = np.column_stack([j, np.where(right, j + 3, j + 2), np.where(right, j + 2, j + 3)])
+            first = [0, 2, 1] if right[0] else [0, 1, 2]
+            last = [n - 3, n - 2, n - 1] if right[-1] else [n - 3, n - 1, n - 2]
+            self._faces = np.concatenate([[first], side_a, side_b, [last]])
+        return self._faces
+
+    @property
+    def face_centers(self):
+        if self._face_centers is None:
+            self._face_centers = face_centers(self.vertices)
+        return self._face_centers
+
+    @property
+    def face_normals(self):
+        if self._face_normals is None:
+            self._face_normals = face_normals(self.vertices)
+        return self._face_normals
+
+    @property
+    def gap(self):
+        return closure_gap(self.vertices)
+
+    def to_grid(self):
+        """ pv.UnstructuredGrid of every tetrahedron, built straight from the arrays. """
+        import pyvista as pv
+
+        return pv.UnstructuredGrid({pv.CellType.TETRA: np.ascontiguousarray(self.cells)}, self.vertices)
+
+    def to_edges(self):
+        """ pv.PolyData wireframe of every edge, without running an edge filter. """
+        import pyvista as pv
+
+        mesh = pv.PolyData()
+        mesh.points = self.vertices
+        mesh.lines = pv.CellArray.from_regular_cells(self.edges.astype(np.int32))
+        return mesh
+
+    def to_surface(self):
+        """ pv.PolyData of the outer surface triangles (the glassy skin of the volume). """
+        import pyvista as pv
+
+        mesh = pv.PolyData()
+        mesh.points = self.vertices
+        mesh.faces = pv.CellArray.from_regular_cells(self.faces.astype(np.int32))
+        return mesh
+
+
+if __name__ == "__main__":
+    import time
+
+    # Quick timing of the kernel on a proton-sized chain
+    start = time.perf_counter()
+    gap = chain_gap(1836, 0.0152)
+    elapsed = time.perf_counter() - start
+    print(f"N=1836 | Gap: {gap:.4f} | {elapsed * 1e6 / 1836:.2f} us/step")
+
+    # Check the transform-power engine against the step-by-step generator
+    print("--- POWER ENGINE CHECK ---")
+    for bend, hinge in [(0.0, 'edge'), (0.0035, 'normal'), (0.0152, 'edge')]:
+        periodic = find_period(bend, hinge) is not None
+        for n in (7, 136, 1836):
+            walked = chain_gap(n, bend, hinge)
+            powered = closure_gap_power(n, bend, hinge)
+            print(f"{hinge:<6} bend={bend:<7} N={n:<5} periodic={periodic!s:<5} | "
+                  f"walk {walked:.6f} | power {powered:.6f} | diff {abs(walked - powered):.1e}")
+
+    # Check the dual-number derivative against a central difference
+    print("--- GAP DERIVATIVE CHECK ---")
+    for n, bend in [(122, 0.1712), (1836, 0.0152)]:
+        gap, slope = chain_gap_slope(n, bend)
+        h = 1e-7
+        numeric = (chain_gap(n, bend + h) - chain_gap(n, bend - h)) / (2 * h)
+        batched = batch_gap_slopes(n, [bend])[1][0]
+        print(f"N={n:<5} bend={bend} | gap {gap:.6f} | slope {slope:.4f} | batched {batched:.4f} | "
+              f"central difference {numeric:.4f}")
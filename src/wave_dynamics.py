@@ -0,0 +1,191 @@
+import os
+
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # The matrix-free operator needs nothing beyond NumPy
+    sparse = None
+
+# Every node of the chain is joined to the next three (tetrahedron i = nodes i..i+3)
+NEIGHBOUR_OFFSETS = (1, 2, 3)
+
+# Sum of k^2 over the offsets: the chain Laplacian tends to -14 d^2/dx^2
+# for fields that vary slowly along the chain
+CONTINUUM_STIFFNESS = float(sum(k * k for k in NEIGHBOUR_OFFSETS))
+
+
+def chain_degree(n):
+    """ Number of neighbours of every node of an n-node chain. """
+    i = np.arange(n)
+    return sum((i >= k).astype(float) + (i < n - k) for k in NEIGHBOUR_OFFSETS)
+
+
+def apply_laplacian(u, out=None, degree=None):
+    """
+    Graph Laplacian (D - A) of the chain applied to `u`, without building a
+    matrix: six shifted slice updates, O(n) work. `u` may carry trailing
+    axes (e.g. a batch of fields as an (n, B) array). Pass the chain_degree
+    vector when applying the operator repeatedly.
+    """
+    if out is None:
+        out = np.empty_like(u)
+    if degree is None:
+        degree = chain_degree(len(u))
+    np.multiply(degree.reshape((-1,) + (1,) * (u.ndim - 1)), u, out=out)
+    for k in NEIGHBOUR_OFFSETS:
+        out[:-k] -= u[k:]
+        out[k:] -= u[:-k]
+    return out
+
+
+def laplacian_matrix(n):
+    """ The same Laplacian as a scipy.sparse CSR matrix (needs SciPy). """
+    if sparse is None:
+        raise ImportError("laplacian_matrix needs SciPy (pip install scipy), which is optional; "
+                          "apply_laplacian computes the same operator with NumPy alone")
+    offsets = [0] + [s * k for k in NEIGHBOUR_OFFSETS for s in (1, -1)]
+    diagonals = [chain_degree(n)] + [-np.ones(n - abs(o)) for o in offsets[1:]]
+    return sparse.diags(diagonals, offsets, format='csr')
+
+
+class WaveSolver:
+    """
+    Discrete wave equation on the chain graph:
+
+        u'' = -c^2 L u - m^2 sin(u)      (sine-Gordon, nonlinear=True)
+        u'' = -c^2 L u - m^2 u           (Klein-Gordon, nonlinear=False)
+
+    integrated with velocity Verlet (leapfrog), which is symplectic, so the
+    energy stays bounded over long runs. Every update is a whole-array NumPy
+    operation. The explicit scheme is stable for dt < 2 / sqrt(12 c^2 + m^2).
+    """
+    def __init__(self, n, coupling=1.0, mass=1.0, nonlinear=True, dt=0.05, matrix=None):
+        self.n = n
+        self.coupling = coupling
+        self.mass = mass
+        self.nonlinear = nonlinear
+        self.dt = dt
+        self.time = 0.0
+
+        limit = 2.0 / np.sqrt(12.0 * coupling ** 2 + mass ** 2)
+        if dt >= limit:
+            raise ValueError(f"dt={dt} is unstable for this chain, need dt < {limit:.4f}")
+
+        # An assembled Laplacian can be passed in: anything with `@`, such as
+        # laplacian_matrix (SciPy) or a dense array. Otherwise the matrix-free
+        # operator is used
+        self.matrix = matrix
+        self.u = np.zeros(n)
+        self.v = np.zeros(n)
+        self._degree = chain_degree(n)
+        self._lap = np.empty(n)
+        self._force = np.empty(n)
+        self._acc = np.empty(n)
+        self.acceleration(self.u, out=self._acc)
+
+    @property
+    def speed(self):
+        """ Long-wavelength wave speed in nodes per unit time. """
+        return self.coupling * np.sqrt(CONTINUUM_STIFFNESS)
+
+    def acceleration(self, u, out=None):
+        if out is None:
+            out = np.empty_like(u)
+        if self.matrix is not None:
+            lap = self.matrix @ u
+        else:
+            lap = apply_laplacian(u, out=self._lap, degree=self._degree)
+        np.multiply(lap, -self.coupling ** 2, out=out)
+        force = self._force
+        if self.nonlinear:
+            np.sin(u, out=force)
+        else:
+            force[:] = u
+        force *= self.mass ** 2
+        out -= force
+        return out
+
+    def step(self, count=1):
+        half_dt = 0.5 * self.dt
+        u, v, acc = self.u, self.v, self._acc
+        for _ in range(count):
+            v += half_dt * acc
+            u += self.dt * v
+            self.acceleration(u, out=acc)
+            v += half_dt * acc
+        self.time += count * self.dt
+
+    def energy_density(self):
+        """ Energy per node: kinetic + on-site potential + half of every spring it touches. """
+        e = 0.5 * self.v ** 2
+        e += self.mass ** 2 * ((1.0 - np.cos(self.u)) if self.nonlinear else 0.5 * self.u ** 2)
+        for k in NEIGHBOUR_OFFSETS:
+            spring = 0.25 * self.coupling ** 2 * (self.u[k:] - self.u[:-k]) ** 2
+            e[:-k] += spring
+            e[k:] += spring
+        return e
+
+    def energy(self):
+        return float(self.energy_density().sum())
+
+    def add_kink(self, center, velocity=0.0, sign=1):
+        """
+        Sine-Gordon kink (a 2*pi twist) centred on node `center`, moving at
+        `velocity` times the wave speed. Width and Lorentz contraction come
+        from the continuum limit of the chain.
+        """
+        x = np.arange(self.n) - center
+        gamma = 1.0 / np.sqrt(1.0 - velocity ** 2)
+        width = self.speed / self.mass / gamma
+        scaled = np.clip(x / width, -700, 700)
+        self.u += 4.0 * np.arctan(np.exp(sign * scaled))
+        # d/dt of u(x - vt): -v * du/dx
+        self.v += -velocity * self.speed * sign * 2.0 / (width * np.cosh(scaled))
+        self.acceleration(self.u, out=self._acc)
+
+    def add_pulse(self, center, width, amplitude=1.0):
+        """ Gaussian displacement released from rest. """
+        x = np.arange(self.n) - center
+        self.u += amplitude * np.exp(-0.5 * (x / width) ** 2)
+        self.acceleration(self.u, out=self._acc)
+
+    def run(self, frames, steps_per_frame=1, callback=None, out_path=None, field='u'):
+        """
+        Advances `frames` frames of `steps_per_frame` steps and streams each
+        frame's field ('u', 'v' or 'energy') to `callback(frame, values)`
+        and/or a (frames, n) float32 .npy memmap at `out_path`.
+        """
+        out = None
+        if out_path is not None:
+            directory = os.path.dirname(out_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            out = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.float32, shape=(frames, self.n))
+
+        for frame in range(frames):
+            self.step(steps_per_frame)
+            values = self.energy_density() if field == 'energy' else getattr(self, field)
+            if callback is not None:
+                callback(frame, values)
+            if out is not None:
+                out[frame] = values
+
+        if out is not None:
+            out.flush()
+
+
+if __name__ == "__main__":
+    import time
+
+    # A travelling kink on a million-node chain: energy should hold steady
+    solver = WaveSolver(10**6, coupling=1.0, mass=0.2, dt=0.1)
+    solver.add_kink(center=2000, velocity=0.5)
+    e0 = solver.energy()
+    start = time.perf_counter()
+    solver.step(100)
+    elapsed = time.perf_counter() - start
+    peak = int(np.argmax(solver.energy_density()))
+    print(f"N=10^6 | 100 steps in {elapsed:.2f} s ({elapsed * 10:.1f} ms/step)")
+    print(f"Kink moved {peak - 2000} nodes (expected {0.5 * solver.speed * solver.time:.1f})")
+    print(f"Energy drift: {abs(solver.energy() - e0) / e0:.2e}")
@@ -0,0 +1,12 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    # Tests never read or write the shared gap cache unless they ask for one
+    monkeypatch.setenv('TRIXLE_GAP_CACHE', '')
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from branch_tracker import BranchTracker, scaling_window
+from resonance import find_resonances
+
+
+class SyntheticTracker(BranchTracker):
+    """ A tracker over an analytic landscape f(N, theta) instead of chain gaps. """
+    def __init__(self, landscape, **options):
+        super().__init__(**options)
+        self.landscape = landscape
+
+    def _gaps(self, steps, thetas):
+        return self.landscape(steps, np.asarray(thetas, dtype=float))[0]
+
+    def _slopes(self, steps, thetas):
+        return self.landscape(steps, np.asarray(thetas, dtype=float))
+
+
+def test_best_per_step_matches_the_per_mass_search():
+    # N=10, 11 and 14 have their best loop near the window edge; N=51 and 53
+    # have one that no branch follows between rescans
+    masses = [*range(10, 17), *range(48, 56)]
+    tracker = BranchTracker(rescan_every=1)
+    tracker.run(masses)
+    best = tracker.best_per_step()
+    assert best['steps'].tolist() == masses
+    for row in best:
+        estimate = 21.0 / row['steps']
+        _, gap = find_resonances(int(row['steps']), estimate * 0.5, estimate * 1.5)[0]
+        assert row['gap'] == pytest.approx(gap, abs=1e-6)
+
+
+def test_rows_stay_inside_the_window():
+    window = scaling_window()
+    tracker = BranchTracker()
+    table = tracker.run(range(10, 80))
+    lo, hi = np.array([window(n) for n in table['steps']]).T
+    assert np.all((table['theta'] >= lo) & (table['theta'] <= hi))
+    # The theta = pi fold of N=10 must not be carried to N=14
+    assert not np.any((table['steps'] == 14) & (np.abs(table['theta'] - np.pi) < 1e-3))
+
+
+def test_two_branches_merge():
+    # Minima at +-sqrt(c^2 - 1/2) that meet at 0 once c^2 < 1/2
+    def landscape(steps, theta):
+        c2 = (1.5 - 0.25 * (steps - 1)) ** 2
+        return (theta ** 2 - c2) ** 2 + theta ** 2, 4 * theta * (theta ** 2 - c2) + 2 * theta
+
+    tracker = SyntheticTracker(landscape, window=lambda steps: (-2.0, 2.0), rescan_every=100)
+    tracker.run(range(1, 8))
+    kinds = [(kind, branch, other) for _, kind, branch, other in tracker.events]
+    assert kinds[:2] == [('appear', 0, -1), ('appear', 1, -1)]
+    assert ('merge', 1, 0) in kinds
+    table = tracker.table()
+    assert table[table['branch'] == 0]['steps'].tolist() == list(range(1, 8))
+    assert abs(table[table['steps'] == 7]['theta'][0]) < 1e-6
+
+
+def test_branch_vanishes_out_of_the_window():
+    # One minimum drifting right by 0.2 per step, out of [0, 1] after N=5
+    def landscape(steps, theta):
+        return (theta - 0.2 * steps) ** 2, 2 * (theta - 0.2 * steps)
+
+    tracker = SyntheticTracker(landscape, window=lambda steps: (0.0, 1.0), rescan_every=100)
+    tracker.run(range(1, 8))
+    assert (1, 'appear', 0, -1) in tracker.events
+    assert (6, 'vanish', 0, -1) in tracker.events
+    table = tracker.table()
+    assert table[table['branch'] == 0]['steps'].tolist() == [1, 2, 3, 4, 5]
+    assert np.all((table['theta'] >= 0.0) & (table['theta'] <= 1.0))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from chain_stream import ChainStats, stream_chain
+from trixle_core import chain_gap, generate_chain
+
+
+def test_stats_merge_matches_numpy():
+    points = np.random.default_rng(2).normal(size=(1000, 3)) * [1.0, 5.0, 0.1] + 40.0
+    stats = ChainStats()
+    for lo, hi in [(0, 1), (1, 4), (4, 4), (4, 500), (500, 1000)]:
+        stats.add(points[lo:hi])
+    assert stats.count == 1000
+    np.testing.assert_allclose(stats.centroid, points.mean(axis=0), rtol=1e-12)
+    rg = np.sqrt(((points - points.mean(axis=0)) ** 2).sum(axis=1).mean())
+    assert stats.radius_of_gyration == pytest.approx(rg, rel=1e-12)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 37, 65536])
+def test_stream_matches_the_built_chain(tmp_path, chunk_size):
+    vertices = generate_chain(500, 0.0152)
+    seen = []
+    path = str(tmp_path / 'chain.npy')
+    stats = stream_chain(500, 0.0152, chunk_size=chunk_size,
+                         callback=lambda start, chunk: seen.append((start, len(chunk))), out_path=path)
+
+    np.testing.assert_array_equal(np.load(path), vertices)
+    assert [start for start, _ in seen] == list(np.cumsum([0] + [n for _, n in seen[:-1]]))
+    assert stats.count == len(vertices)
+    assert stats.gap == pytest.approx(chain_gap(500, 0.0152), rel=1e-12)
+    np.testing.assert_allclose(stats.centroid, vertices.mean(axis=0), rtol=1e-10)
+    rg = np.sqrt(((vertices - vertices.mean(axis=0)) ** 2).sum(axis=1).mean())
+    assert stats.radius_of_gyration == pytest.approx(rg, rel=1e-10)
+
+
+def test_stream_takes_a_bend_profile():
+    profile = 0.0152 * (1 + 0.1 * np.sin(np.linspace(0, 2 * np.pi, 300)))
+    stats = stream_chain(300, profile, chunk_size=64)
+    assert stats.gap == pytest.approx(chain_gap(300, profile), rel=1e-12)
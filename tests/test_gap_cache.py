@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+import gap_cache
+from gap_cache import GapCache, cached_batch_gaps, cached_gap
+from trixle_core import batch_gaps, chain_gap
+
+
+def test_round_trip_through_the_log(tmp_path):
+    path = str(tmp_path / 'gaps.bin')
+    cache = GapCache(path)
+    thetas = np.linspace(0.1, 0.2, 7)
+    gaps = cached_batch_gaps(122, thetas, cache=cache)
+    np.testing.assert_array_equal(gaps, batch_gaps(122, thetas))
+
+    # A second process sees every record, for either kernel path
+    reader = GapCache(path)
+    assert len(reader) == 7
+    assert reader.get(122, thetas[3]) == gaps[3]
+    assert cached_gap(122, thetas[3], cache=reader) == gaps[3]
+    assert reader.get(122, thetas[3], 'normal') is None
+    assert reader.get(123, thetas[3]) is None
+
+
+def test_cached_gap_matches_the_scalar_kernel(tmp_path):
+    cache = GapCache(str(tmp_path / 'gaps.bin'))
+    first = cached_gap(136, 0.1543, cache=cache)
+    assert first == chain_gap(136, 0.1543)
+    assert cached_gap(136, 0.1543, cache=cache) == first
+    # The batched kernel agrees to rounding
+    assert batch_gaps(136, [0.1543])[0] == pytest.approx(first, rel=1e-12)
+
+
+def test_compaction_keeps_the_live_entries(tmp_path):
+    cache = GapCache(str(tmp_path / 'gaps.bin'), max_entries=4)
+    for theta in np.linspace(0.1, 0.2, 10):
+        cache.put(50, theta, theta * 2)
+    assert len(cache) == 4
+    assert GapCache(cache.path).get(50, 0.2) == 0.4
+
+
+def test_per_step_hinges_are_rejected_by_the_cache(tmp_path):
+    cache = GapCache(str(tmp_path / 'gaps.bin'))
+    rules = np.array(['edge', 'normal'] * 5)
+    with pytest.raises(ValueError, match='one hinge rule'):
+        cache.get(10, 0.1, rules)
+    with pytest.raises(ValueError, match='Unknown hinge'):
+        cache.put(10, 0.1, 1.0, 'twist')
+
+
+def test_per_step_hinges_skip_the_shared_cache(tmp_path, monkeypatch):
+    path = tmp_path / 'gaps.bin'
+    monkeypatch.setenv('TRIXLE_GAP_CACHE', str(path))
+    rules = np.array(['edge', 'normal'] * 5)
+    assert cached_gap(10, 0.1, rules) == chain_gap(10, 0.1, rules)
+    np.testing.assert_array_equal(cached_batch_gaps(10, [0.1, 0.2], rules), batch_gaps(10, [0.1, 0.2], rules))
+    assert not path.exists() or len(GapCache(str(path))) == 0
+
+
+def test_default_path_is_anchored_to_the_repository():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert gap_cache.DEFAULT_PATH == os.path.join(root, 'results', 'gap_cache.bin')
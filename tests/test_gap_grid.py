@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+import gap_grid
+from gap_grid import GapGrid
+from trixle_core import chain_gap
+
+STEPS = np.array([3, 10, 57, 122])
+BENDS = np.linspace(0.05, 0.25, 11)
+
+
+def test_grid_matches_the_scalar_kernel(tmp_path):
+    grid = GapGrid(STEPS, BENDS, path=str(tmp_path / 'grid.npy'), tile_size=4)
+    grid.fill(progress=False)
+    assert grid.complete
+    expected = [[chain_gap(n, t) for t in BENDS] for n in STEPS]
+    np.testing.assert_allclose(grid.gaps, expected, rtol=1e-5)
+
+
+def test_fill_resumes_after_an_interruption(tmp_path):
+    path = str(tmp_path / 'grid.npy')
+    grid = GapGrid(STEPS, BENDS, path=path, tile_size=4)
+    grid.fill(progress=False)
+    full = np.array(grid.gaps)
+
+    # Forget the middle tile, as if the run had stopped before flagging it
+    grid.gaps[:, 4:8] = np.nan
+    grid.done[1] = 0
+    grid.gaps.flush()
+    grid.done.flush()
+    del grid
+
+    grid = GapGrid(STEPS, BENDS, path=path, tile_size=4)
+    assert not grid.complete
+    grid.fill(progress=False)
+    np.testing.assert_array_equal(grid.gaps, full)
+
+
+def test_reopening_with_other_axes_raises(tmp_path):
+    path = str(tmp_path / 'grid.npy')
+    GapGrid(STEPS, BENDS, path=path, tile_size=4)
+    with pytest.raises(ValueError, match='different grid'):
+        GapGrid(STEPS, BENDS[:-1], path=path, tile_size=4)
+    with pytest.raises(ValueError, match='tiled differently'):
+        GapGrid(STEPS, BENDS, path=path, tile_size=8)
+
+
+@pytest.mark.parametrize('sidecar', ['grid.done.npy', 'grid.axes.npz'])
+def test_missing_sidecar_raises(tmp_path, sidecar):
+    path = str(tmp_path / 'grid.npy')
+    GapGrid(STEPS, BENDS, path=path, tile_size=4)
+    os.remove(tmp_path / sidecar)
+    with pytest.raises(ValueError, match='remove it or choose another path'):
+        GapGrid(STEPS, BENDS, path=path, tile_size=4)
+
+
+def test_downsample_keeps_block_minima(tmp_path):
+    grid = GapGrid(STEPS, BENDS, path=str(tmp_path / 'grid.npy'), tile_size=4)
+    grid.fill(progress=False)
+    small, row_edges, col_edges = grid.downsample(max_rows=2, max_cols=3, row_block=1)
+    full = np.array(grid.gaps)
+    for r in range(len(row_edges) - 1):
+        for c in range(len(col_edges) - 1):
+            block = full[row_edges[r]:row_edges[r + 1], col_edges[c]:col_edges[c + 1]]
+            assert small[r, c] == block.min()
+
+
+def test_default_path_is_anchored_to_the_repository():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert gap_grid.DEFAULT_PATH == os.path.join(root, 'results', 'gap_grid.npy')
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from geometry_metrics import (arc_fraction, centroid_distance, curvature, edge_strain, face_torsion, map_to_curve,
+                              step_metrics)
+from trixle_core import generate_chain, tetra_centers
+
+
+def test_regular_helix_is_unstrained_and_evenly_curved():
+    # Zero bend stacks regular tetrahedra into the Boerdijk-Coxeter helix
+    vertices = generate_chain(200, 0.0)
+    np.testing.assert_allclose(edge_strain(vertices), 0.0, atol=1e-12)
+    kappa = curvature(vertices)
+    assert kappa.min() > 0
+    np.testing.assert_allclose(kappa, kappa[0], rtol=1e-9)
+    torsion = face_torsion(vertices)
+    np.testing.assert_allclose(torsion, torsion[0], rtol=1e-9)
+
+
+def test_bent_chain_is_strained():
+    assert edge_strain(generate_chain(50, 0.17)).max() > 1e-3
+
+
+def test_metrics_match_their_definitions():
+    vertices = generate_chain(60, 0.17)
+    centers = tetra_centers(vertices)
+    np.testing.assert_allclose(centroid_distance(vertices), np.linalg.norm(centers - vertices.mean(axis=0), axis=1))
+
+    j = 20
+    a, b = centers[j] - centers[j - 1], centers[j + 1] - centers[j]
+    turn = np.arccos(a @ b / np.linalg.norm(a) / np.linalg.norm(b))
+    assert curvature(vertices)[j] == pytest.approx(turn / (0.5 * (np.linalg.norm(a) + np.linalg.norm(b))))
+
+    metrics = step_metrics(vertices)
+    assert all(len(values) == 61 for values in metrics.values())
+
+
+def test_map_to_curve_stays_in_range():
+    vertices = generate_chain(120, 0.17)
+    values = np.sin(np.arange(121) / 7.0)
+    curve = vertices[::2] + 0.01
+    mapped = map_to_curve(values, vertices, curve)
+    assert len(mapped) == len(curve)
+    assert values.min() - 1e-12 <= mapped.min() and mapped.max() <= values.max() + 1e-12
+    # The ends of the curve take the end tetrahedra's values
+    assert mapped[0] == values[0] and mapped[-1] == values[-1]
+    s = arc_fraction(curve)
+    assert s[0] == 0.0 and s[-1] == 1.0 and np.all(np.diff(s) >= 0)
@@ -0,0 +1,19 @@
+from isotopescanner import IsotopeScanner
+from resonance import find_resonances
+
+
+def test_small_sweep_reports_every_mass(capsys):
+    scanner = IsotopeScanner()
+    scanner.run_sweep(range(120, 125))
+    assert sorted(mass for mass, _ in scanner.results) == [120, 121, 122, 123, 124]
+    gaps = [gap for _, gap in scanner.results]
+    assert gaps == sorted(gaps)
+    assert "TOP 10 STABLE ISOTOPES" in capsys.readouterr().out
+
+
+def test_sweep_matches_the_per_mass_search():
+    scanner = IsotopeScanner()
+    scanner.run_sweep(range(120, 123))
+    for mass, gap in scanner.results:
+        estimate = 21.0 / mass
+        assert gap == find_resonances(mass, estimate * 0.5, estimate * 1.5)[0][1]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from mirrorscanner import ChiralityTest
+from trixle_core import chain_gap
+
+
+@pytest.fixture
+def test():
+    chirality = ChiralityTest()
+    chirality.steps = 122
+    return chirality
+
+
+def test_scan_both_matches_the_scalar_kernel(test):
+    bends, pos, neg = test.scan_both(0.1, 0.2, 5)
+    for theta, p, n in zip(bends, pos, neg):
+        assert p == pytest.approx(chain_gap(122, theta), rel=1e-9)
+        assert n == pytest.approx(chain_gap(122, -theta), rel=1e-9)
+
+
+def test_small_grid_derives_its_levels(test):
+    result = test.analyze(0.15, 0.19, points=101)
+    assert [row['points'] for row in result['levels']] == [101]
+
+    result = test.analyze(0.15, 0.19, points=1001)
+    assert [row['points'] for row in result['levels']] == [101, 1001]
+
+
+@pytest.mark.parametrize('points, levels', [(101, 4), (1001, 4), (10, 1)])
+def test_too_few_points_for_the_levels(test, points, levels):
+    with pytest.raises(ValueError):
+        test.analyze(0.15, 0.19, points=points, levels=levels)
+
+
+def test_refined_minima_sit_below_the_grid(test):
+    result = test.analyze(0.15, 0.19, points=1001)
+    assert result['min_gaps'][0] <= result['matter'].min() + 1e-12
+    assert result['min_gaps'][1] <= result['antimatter'].min() + 1e-12
+    assert result['ratio'] == pytest.approx(result['min_gaps'][1] / result['min_gaps'][0])
+    assert np.all(result['minima'][0] > 0) and result['minima'][1] < 0
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from resonance import (SCALAR_BATCH, bracket_minima, chain_gaps, find_minima, find_resonances, gap_slopes,
+                       refine_minima, scan_modulation)
+from trixle_core import batch_gaps, chain_gap, modulation_profiles
+
+
+def test_refine_minima_on_a_known_curve():
+    # sin has minima at 3 pi / 2 + 2 pi k
+    lo, hi, x0 = np.array([4.0, 10.0, 17.0]), np.array([5.5, 11.5, 17.5]), np.array([4.5, 11.0, 17.2])
+    xs, fs, calls = refine_minima(lambda x: (np.sin(x), np.cos(x)), lo, hi, x0, tol=1e-10)
+    np.testing.assert_allclose(xs, 1.5 * np.pi + 2 * np.pi * np.arange(3), atol=1e-7)
+    np.testing.assert_allclose(fs, -1.0, atol=1e-12)
+    assert calls < 20
+
+
+def test_bracket_minima_against_brute_force():
+    rng = np.random.default_rng(3)
+    fs = rng.random(200)
+    brute = [i for i in range(200)
+             if (i == 0 or fs[i] <= fs[i - 1]) and (i == 199 or fs[i] < fs[i + 1])]
+    assert bracket_minima(np.arange(200), fs).tolist() == brute
+
+
+@pytest.mark.parametrize('steps, lo, hi', [(122, 0.086, 0.258), (1836, 0.001, 0.02)])
+def test_resonances_reach_the_dense_grid_minimum(steps, lo, hi):
+    resonances = find_resonances(steps, lo, hi)
+    dense = np.linspace(lo, hi, 4001)
+    gaps = batch_gaps(steps, dense)
+    best = int(np.argmin(gaps))
+    theta, gap = resonances[0]
+    assert gap <= gaps[best] + 1e-9
+    assert abs(theta - dense[best]) < 2 * (dense[1] - dense[0])
+
+
+def test_derivative_search_agrees_with_brent():
+    lo, hi = 21.0 / 122 * 0.5, 21.0 / 122 * 1.5
+    brent = find_minima(lambda t: chain_gap(122, t), lo, hi)
+    derivative = find_resonances(122, lo, hi)
+    assert derivative[0][0] == pytest.approx(brent[0][0], abs=1e-6)
+    assert derivative[0][1] == pytest.approx(brent[0][1], rel=1e-6, abs=1e-9)
+
+
+@pytest.mark.parametrize('count', [3, SCALAR_BATCH + 5])
+def test_both_kernel_paths_agree(count):
+    thetas = np.linspace(0.1, 0.2, count)
+    gaps, slopes = gap_slopes(136, thetas)
+    np.testing.assert_allclose(chain_gaps(136, thetas), [chain_gap(136, t) for t in thetas], rtol=1e-10)
+    np.testing.assert_allclose(gaps, [chain_gap(136, t) for t in thetas], rtol=1e-10)
+    h = 1e-6
+    numeric = (batch_gaps(136, thetas + h) - batch_gaps(136, thetas - h)) / (2 * h)
+    np.testing.assert_allclose(slopes, numeric, rtol=1e-4, atol=1e-4)
+
+
+def test_modulation_scan_matches_the_scalar_walk():
+    amplitudes, frequencies = [0.0, 0.05, 0.2], [1, 3]
+    gaps = scan_modulation(122, 0.1712, amplitudes, frequencies)
+    assert gaps.shape == (3, 2)
+    profiles = modulation_profiles(122, 0.1712, amplitudes, frequencies)
+    for a in range(3):
+        for f in range(2):
+            assert gaps[a, f] == pytest.approx(chain_gap(122, profiles[a, f]), rel=1e-10)
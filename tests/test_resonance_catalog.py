@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+
+import resonance_catalog
+from resonance_catalog import ResonanceCatalog, solve_steps
+
+
+def filled_catalog(path, n_min=95, n_max=112):
+    catalog = ResonanceCatalog(str(path))
+    catalog.extend(n_min, n_max)
+    catalog.table['done'] = 1
+    catalog.table['min_gap'] = np.linspace(0.0, 1.0, n_max - n_min + 1)
+    catalog.table.flush()
+    return ResonanceCatalog(str(path))
+
+
+def test_query_outside_the_table_is_empty(tmp_path):
+    catalog = filled_catalog(tmp_path / 'catalog.npy')
+    assert len(catalog.query(n_lo=3, n_hi=93)) == 0
+    assert len(catalog.query(n_lo=113, n_hi=200)) == 0
+    assert len(catalog.query(n_lo=110, n_hi=100)) == 0
+
+
+def test_query_clips_to_the_table(tmp_path):
+    catalog = filled_catalog(tmp_path / 'catalog.npy')
+    assert catalog.query(n_lo=3, n_hi=97)['steps'].tolist() == [95, 96, 97]
+    assert catalog.query(n_lo=110, n_hi=500)['steps'].tolist() == [110, 111, 112]
+    assert len(catalog.query()) == 18
+    assert len(catalog.query(max_gap=0.5)) == 9
+
+
+def test_lookups_are_read_only_until_a_build(tmp_path):
+    path = tmp_path / 'catalog.npy'
+    catalog = ResonanceCatalog(str(path))
+    catalog.build(40, 41)
+    catalog = ResonanceCatalog(str(path))
+    assert catalog.table.mode == 'r'
+    assert catalog.best_factor(40) == solve_steps(40)[1]
+    assert catalog.best_factor(39, default=-1.0) == -1.0
+
+    # Rebuilding inside the range still needs a writable table
+    catalog.build(40, 41)
+    assert catalog.table.mode == 'r+'
+    catalog.build(39, 41)
+    assert catalog.query()['steps'].tolist() == [39, 40, 41]
+
+
+def test_default_path_is_anchored_to_the_repository():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert resonance_catalog.DEFAULT_PATH == os.path.join(root, 'results', 'resonance_catalog.npy')
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from spatial_index import SpatialHash, best_closure, min_approach, tetra_overlap, tetra_overlaps
+from trixle_core import generate_chain, tetra_centers, tetra_windows
+
+
+def brute_pairs(points, radius, min_separation):
+    d = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    i, j = np.nonzero(np.triu(d < radius, k=min_separation))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+@pytest.mark.parametrize('chunk_size', [1 << 20, 7])
+def test_pairs_match_brute_force(chunk_size):
+    points = np.random.default_rng(0).random((400, 3)) * 4.0
+    grid = SpatialHash(points, 0.5)
+    i, j, d = grid.pairs(radius=0.4, min_separation=3, chunk_size=chunk_size)
+    assert set(zip(i.tolist(), j.tolist())) == brute_pairs(points, 0.4, 3)
+    np.testing.assert_allclose(d, np.linalg.norm(points[i] - points[j], axis=1))
+
+
+def test_radius_may_not_exceed_the_cell():
+    with pytest.raises(ValueError):
+        SpatialHash(np.zeros((2, 3)), 1.0).pairs(radius=2.0)
+
+
+def test_min_approach_matches_brute_force():
+    vertices = generate_chain(300, 0.12)
+    centers = tetra_centers(vertices)
+    d = np.linalg.norm(centers[:, None] - centers[None, :], axis=-1)
+    d[np.tril_indices(len(centers), 3)] = np.inf
+    distance, i, j = min_approach(vertices)
+    assert distance == pytest.approx(d.min())
+    assert d[i, j] == pytest.approx(distance)
+
+
+def test_best_closure_matches_every_prefix():
+    vertices = generate_chain(200, 0.1712)
+    steps, gap = best_closure(vertices, min_steps=5)
+    centers = tetra_centers(vertices)
+    gaps = np.linalg.norm(centers[5:] - centers[0], axis=1)
+    assert steps == 5 + int(np.argmin(gaps))
+    assert gap == gaps.min()
+
+
+def test_overlaps_match_the_separating_axis_test_on_every_pair():
+    # A tightly bent chain passes through itself many times
+    vertices = generate_chain(200, 0.3)
+    windows = tetra_windows(vertices)
+    i, j = np.triu_indices(len(windows), 4)
+    hit = tetra_overlap(windows[i], windows[j])
+    found_i, found_j = tetra_overlaps(vertices)
+    assert hit.any()
+    assert set(zip(found_i.tolist(), found_j.tolist())) == set(zip(i[hit].tolist(), j[hit].tolist()))
+
+
+def test_overlap_of_simple_tetrahedra():
+    tet = np.array([[0.0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    assert tetra_overlap(tet[None], (tet + 0.1)[None])[0]
+    assert not tetra_overlap(tet[None], (tet + 2.0)[None])[0]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from structure_analysis import find_peaks, prefix_profiles, radial_profile, smooth
+from trixle_core import generate_chain
+
+
+def brute_peaks(values):
+    """ Peaks and prominences of one closed loop by walking out from each peak. """
+    n = len(values)
+    peaks = {}
+    for p in range(n):
+        height = values[p]
+        if not (height > values[p - 1] and height >= values[(p + 1) % n]):
+            continue
+        lows = []
+        for direction in (-1, 1):
+            low = height
+            for k in range(1, n):
+                v = values[(p + direction * k) % n]
+                if v > height:
+                    break
+                low = min(low, v)
+            else:
+                # The tallest peak: nothing separates it from anything
+                low = values.min()
+            lows.append(low)
+        peaks[p] = height - max(lows)
+    return peaks
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_prominence_matches_brute_force(seed):
+    values = np.random.default_rng(seed).random((3, 97))
+    rows, positions, prominence = find_peaks(values)
+    for r in range(3):
+        found = dict(zip(positions[rows == r].tolist(), prominence[rows == r].tolist()))
+        expected = brute_peaks(values[r])
+        assert found.keys() == expected.keys()
+        for p in expected:
+            assert found[p] == pytest.approx(expected[p], abs=1e-12)
+
+
+def test_min_prominence_filters_peaks():
+    values = np.random.default_rng(9).random(200)
+    _, positions, prominence = find_peaks(values, min_prominence=0.5)
+    expected = {p for p, q in brute_peaks(values).items() if q >= 0.5}
+    assert set(positions.tolist()) == expected
+    assert np.all(prominence >= 0.5)
+
+
+def test_smooth_is_a_circular_moving_average():
+    values = np.random.default_rng(1).random(40)
+    window = 7
+    expected = [np.mean([values[(i + k) % 40] for k in range(-3, 4)]) for i in range(40)]
+    np.testing.assert_allclose(smooth(values, window), expected)
+
+
+def test_prefix_profiles_average_each_prefix():
+    vertices = generate_chain(120, 0.17)
+    profiles = prefix_profiles(vertices, [30, 120], samples=10)
+    for row, n in zip(profiles, (30, 120)):
+        profile = radial_profile(vertices[:n + 4])
+        edges = np.arange(11) * (n + 4) // 10
+        np.testing.assert_allclose(row, [profile[a:b].mean() for a, b in zip(edges[:-1], edges[1:])])
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from topology_metrics import chain_topology, dihedral_twist, total_twist, writhe
+from trixle_core import generate_chain, tetra_centers
+
+
+def solid_angle(p1, p2, p3, p4):
+    """ Klenin & Langowski's signed solid angle of one segment pair, written out plainly. """
+    r13, r14, r23, r24 = p3 - p1, p4 - p1, p3 - p2, p4 - p2
+    normals = [np.cross(r13, r14), np.cross(r14, r24), np.cross(r24, r23), np.cross(r23, r13)]
+    normals = [n / np.linalg.norm(n) for n in normals]
+    omega = sum(np.arcsin(np.clip(normals[k] @ normals[(k + 1) % 4], -1.0, 1.0)) for k in range(4))
+    return omega * np.sign(np.cross(p4 - p3, p2 - p1) @ r13)
+
+
+def brute_writhe(points, closed=True):
+    p = np.vstack([points, points[:1]]) if closed else points
+    m = len(p) - 1
+    total = 0.0
+    for i in range(m):
+        for j in range(i + 2, m):
+            if closed and i == 0 and j == m - 1:
+                continue
+            total += solid_angle(p[i], p[i + 1], p[j], p[j + 1])
+    return total / (2.0 * np.pi)
+
+
+def trefoil(n=60):
+    t = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.column_stack([np.sin(t) + 2 * np.sin(2 * t), np.cos(t) - 2 * np.cos(2 * t), -np.sin(3 * t)])
+
+
+@pytest.mark.parametrize('closed', [True, False])
+def test_writhe_matches_the_pair_by_pair_sum(closed):
+    points = trefoil()
+    expected = brute_writhe(points, closed)
+    assert writhe(points, closed=closed, tile=7) == pytest.approx(expected, abs=1e-10)
+    assert writhe(points, closed=closed) == pytest.approx(expected, abs=1e-10)
+
+
+def test_writhe_flips_under_a_mirror():
+    points = trefoil()
+    mirrored = points * [1.0, 1.0, -1.0]
+    assert writhe(mirrored) == pytest.approx(-writhe(points), abs=1e-10)
+    assert abs(writhe(points)) > 1.0
+
+
+def test_planar_loop_has_no_writhe():
+    t = np.linspace(0, 2 * np.pi, 50, endpoint=False)
+    assert writhe(np.column_stack([np.cos(t), np.sin(t), np.zeros_like(t)])) == pytest.approx(0.0, abs=1e-12)
+
+
+def test_far_field_approximates_the_exact_sum():
+    centers = tetra_centers(generate_chain(600, 0.0152 * 1836 / 600))
+    exact = writhe(centers)
+    assert writhe(centers, far_field=8.0) == pytest.approx(exact, abs=2e-3)
+
+
+def test_twist_adds_up():
+    vertices = generate_chain(144, 0.1458)
+    twist = dihedral_twist(vertices)
+    assert total_twist(vertices) == pytest.approx(twist.sum() / 360.0)
+    topology = chain_topology(vertices)
+    assert topology['total_twist'] == pytest.approx(twist.sum() / 360.0)
+    assert topology['writhe'] == pytest.approx(writhe(tetra_centers(vertices)))
+
+
+def test_twist_is_unwrapped_across_the_branch_cut():
+    # The proton's dihedral drifts through +-180 degrees along the loop
+    twist = dihedral_twist(generate_chain(1836, 0.0152))
+    assert twist.max() > 180.0
+    assert np.abs(np.diff(twist)).max() < 180.0
+    assert twist[0] == pytest.approx(np.degrees(np.arccos(1.0 / 3.0)), abs=0.1)
+
+
+def test_straight_helix_twist_is_constant():
+    twist = dihedral_twist(generate_chain(200, 0.0))
+    assert twist.std() < 1e-9
+    assert twist.mean() == pytest.approx(np.degrees(np.arccos(1.0 / 3.0)))
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from neutrinoscanner import NeutrinoScanner
+from trixle_core import (KERNEL_VERSION, TrixleChain, batch_gaps, batch_profile_gaps, chain_gap, closure_gap_power,
+                         find_period, modulation_profiles, prefix_scan, tetra_centers, tetra_windows)
+
+
+@pytest.mark.parametrize('bend, hinge', [(0.0, 'edge'), (0.0035, 'normal'), (0.0152, 'edge')])
+@pytest.mark.parametrize('steps', [3, 12, 577, 1836])
+def test_periodic_power_matches_the_walk(bend, hinge, steps):
+    assert closure_gap_power(steps, bend, hinge) == pytest.approx(chain_gap(steps, bend, hinge), rel=1e-9, abs=1e-9)
+
+
+def test_period_is_found_once_per_bend_and_hinge():
+    first = find_period(0.0035, 'normal')
+    assert first is not None and first[0] == 1
+    assert find_period(0.0035, 'normal') is first
+    assert not first[1].flags.writeable
+    assert find_period(0.0152, 'edge') is None
+
+
+def test_neutrino_loop_uses_its_bend():
+    scanner = NeutrinoScanner()
+    scanner.bend_factor = 0.05
+    assert scanner.check_loop(6) == chain_gap(6, 0.05)
+
+
+def test_tetra_helpers_match_the_explicit_loops():
+    chain = TrixleChain.build(40, 0.17)
+    vertices = chain.vertices
+    windows = tetra_windows(vertices)
+    assert windows.shape == (41, 4, 3)
+    for j in (0, 17, 40):
+        np.testing.assert_array_equal(windows[j], vertices[j:j + 4])
+    np.testing.assert_array_equal(chain.windows, windows)
+    np.testing.assert_allclose(tetra_centers(vertices), windows.mean(axis=1), rtol=1e-14, atol=1e-14)
+
+    gaps, _ = prefix_scan([5, 40], 0.17)
+    np.testing.assert_allclose(gaps, [chain_gap(5, 0.17), chain_gap(40, 0.17)], rtol=1e-12)
+
+
+@pytest.mark.parametrize('hinge', ['edge', 'normal', 'per-step'])
+def test_profile_kernel_matches_the_scalar_walk(hinge):
+    steps = 90
+    if hinge == 'per-step':
+        hinge = np.where(np.arange(steps) % 3 == 0, 'normal', 'edge')
+    profiles = modulation_profiles(steps, 0.2, [0.0, 0.1, 0.3], [1, 2, 5]).reshape(-1, steps)
+    gaps = batch_profile_gaps(profiles, hinge, chunk_size=4)
+    expected = [chain_gap(steps, profile, hinge) for profile in profiles]
+    np.testing.assert_allclose(gaps, expected, rtol=1e-10)
+
+    # An unmodulated profile is the constant-bend chain
+    assert gaps[0] == pytest.approx(chain_gap(steps, 0.2, hinge), rel=1e-12)
+
+
+@pytest.mark.parametrize('bend', [0.0, 0.17, -0.05])
+def test_surface_faces_wind_outward(bend):
+    chain = TrixleChain.build(12, bend)
+    vertices, faces = chain.vertices, chain.faces
+    # Every face belongs to the tetrahedron of its lowest vertex, bar the last cap
+    owner = np.minimum(faces.min(axis=1), chain.steps)
+    tri = vertices[faces]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    outward = tri.mean(axis=1) - tetra_centers(vertices)[owner]
+    assert np.all(np.einsum('ij,ij->i', normals, outward) > 0)
+
+    # A closed, consistently wound skin: every directed edge appears exactly once
+    directed = np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]])
+    assert len({tuple(e) for e in directed.tolist()}) == len(directed)
+    assert {tuple(e) for e in directed.tolist()} == {(b, a) for a, b in directed.tolist()}
+
+
+@pytest.mark.filterwarnings('ignore:The default value of .algorithm.')
+def test_edges_and_faces_match_the_pyvista_filters():
+    pv = pytest.importorskip('pyvista')
+    chain = TrixleChain.build(10, 0.17)
+    grid = chain.to_grid()
+    all_edges = grid.extract_all_edges()
+    surface = grid.extract_surface()
+    assert len(chain.edges) == all_edges.n_cells == chain.to_edges().n_lines
+    assert len(chain.faces) == surface.n_cells == chain.to_surface().n_cells
+
+    # Same triangles, matched by vertex position
+    index = {tuple(p): i for i, p in enumerate(np.round(chain.vertices, 9).tolist())}
+    points = np.round(surface.points, 9).tolist()
+    triangles = surface.faces.reshape(-1, 4)[:, 1:]
+    found = {tuple(sorted(index[tuple(points[k])] for k in tri)) for tri in triangles.tolist()}
+    assert found == {tuple(sorted(face)) for face in chain.faces.tolist()}
+    assert isinstance(all_edges, pv.PolyData)
+
+
+# Gaps computed by KERNEL_VERSION 1, to the last bit. If the kernel's
+# arithmetic changes these, cached gaps are stale: bump KERNEL_VERSION.
+PINNED_GAPS = [
+    (1836, 0.0152, 'edge', '0x1.699b0b169c170p+2', '0x1.699b0b169c175p+2'),
+    (122, 0.1712, 'edge', '0x1.9569d921bb94bp-5', '0x1.9569d921bc0aap-5'),
+    (122, -0.05, 'edge', '0x1.9f70986d5c3a5p+5', None),
+    (136, 0.1543, 'normal', '0x1.e6927ab93028ap+6', None),
+]
+
+
+@pytest.mark.parametrize('steps, bend, hinge, batched, scalar', PINNED_GAPS)
+def test_gaps_are_pinned_for_the_kernel_version(steps, bend, hinge, batched, scalar):
+    assert KERNEL_VERSION == 1
+    assert batch_gaps(steps, [bend], hinge)[0] == float.fromhex(batched)
+    if scalar is not None:
+        assert chain_gap(steps, bend, hinge) == float.fromhex(scalar)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+import wave_dynamics
+from wave_dynamics import WaveSolver, apply_laplacian, chain_degree, laplacian_matrix
+
+
+def dense_laplacian(n):
+    distance = np.abs(np.subtract.outer(np.arange(n), np.arange(n)))
+    adjacency = ((distance >= 1) & (distance <= 3)).astype(float)
+    return np.diag(adjacency.sum(axis=1)) - adjacency
+
+
+def test_laplacian_matches_the_dense_reference():
+    rng = np.random.default_rng(0)
+    dense = dense_laplacian(12)
+    u = rng.random(12)
+    np.testing.assert_allclose(apply_laplacian(u), dense @ u)
+    np.testing.assert_array_equal(chain_degree(12), np.diag(dense))
+
+    batch = rng.random((12, 5))
+    np.testing.assert_allclose(apply_laplacian(batch), dense @ batch)
+
+
+def test_matrix_path_matches_the_matrix_free_one():
+    free = WaveSolver(40, dt=0.1)
+    dense = WaveSolver(40, dt=0.1, matrix=dense_laplacian(40))
+    for solver in (free, dense):
+        solver.add_pulse(20, 3.0)
+        solver.step(50)
+    np.testing.assert_allclose(dense.u, free.u, atol=1e-12)
+
+
+def test_sparse_matrix_needs_scipy(monkeypatch):
+    monkeypatch.setattr(wave_dynamics, 'sparse', None)
+    with pytest.raises(ImportError, match='SciPy'):
+        laplacian_matrix(10)
+
+
+def test_sparse_matrix_matches_the_dense_reference():
+    pytest.importorskip('scipy')
+    np.testing.assert_allclose(laplacian_matrix(12).toarray(), dense_laplacian(12))
+
+
+@pytest.mark.parametrize('nonlinear', [True, False])
+def test_verlet_energy_stays_bounded(nonlinear):
+    solver = WaveSolver(2000, coupling=1.0, mass=0.2, dt=0.1, nonlinear=nonlinear)
+    if nonlinear:
+        solver.add_kink(500, velocity=0.5)
+    else:
+        solver.add_pulse(1000, 10.0)
+    e0 = solver.energy()
+    drift = []
+    for _ in range(40):
+        solver.step(50)
+        drift.append(abs(solver.energy() - e0) / e0)
+    # Leapfrog energy oscillates at O(dt^2) but never builds up
+    assert max(drift) < 1e-3
+    assert max(drift[20:]) < 2 * max(drift[:20]) + 1e-12
+
+
+def test_kink_travels_at_its_set_speed():
+    solver = WaveSolver(4000, coupling=1.0, mass=0.2, dt=0.1)
+    solver.add_kink(1000, velocity=0.5)
+    solver.step(1000)
+    moved = int(np.argmax(solver.energy_density())) - 1000
+    assert moved == pytest.approx(0.5 * solver.speed * solver.time, abs=2)
+
+
+def test_unstable_time_step_is_refused():
+    limit = 2.0 / np.sqrt(12.0 * 1.5 ** 2 + 0.3 ** 2)
+    with pytest.raises(ValueError, match='unstable'):
+        WaveSolver(10, coupling=1.5, mass=0.3, dt=limit)
+    WaveSolver(10, coupling=1.5, mass=0.3, dt=0.99 * limit)